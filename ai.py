@@ -0,0 +1,501 @@
+from array import array
+from board import ShipType
+from engine import ShotResult
+from os import cpu_count
+from random import Random, choice, randrange
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING
+from util import IntEnum, enumAuto
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+numpy = None
+numpyChecked = False
+
+
+def loadNumpy() -> bool:
+    global numpy, numpyChecked
+    if not numpyChecked:
+        numpyChecked = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy is not None
+
+
+class CellPool:
+    SPARSE_AREA = 1 << 16
+
+    @staticmethod
+    def create(size: int) -> "CellPool | SparseCellPool":
+        if size * size > CellPool.SPARSE_AREA:
+            return SparseCellPool(size)
+        return CellPool(size)
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.cells: array[int] = array("i", range(size * size))
+        self.positions: array[int] = array("i", range(size * size))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        return self.positions[cell[0] * self.size + cell[1]] >= 0
+
+    def random(self) -> tuple[int, int]:
+        return divmod(self.cells[randrange(len(self.cells))], self.size)
+
+    def remove(self, cell: tuple[int, int]) -> None:
+        index: int = cell[0] * self.size + cell[1]
+        position: int = self.positions[index]
+        if position < 0:
+            return
+
+        last: int = self.cells.pop()
+        if last != index:
+            self.cells[position] = last
+            self.positions[last] = position
+        self.positions[index] = -1
+
+    def draw(self) -> tuple[int, int]:
+        cell: tuple[int, int] = self.random()
+        self.remove(cell)
+        return cell
+
+
+class SparseCellPool:
+    DENSE_RATIO = 0.5
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.tried: set[tuple[int, int]] = set()
+        self.pool: CellPool | None = None
+
+    def __len__(self) -> int:
+        if self.pool is not None:
+            return len(self.pool)
+        return self.size * self.size - len(self.tried)
+
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        if self.pool is not None:
+            return cell in self.pool
+        return cell not in self.tried
+
+    def random(self) -> tuple[int, int]:
+        if self.pool is not None:
+            return self.pool.random()
+        while True:
+            cell: tuple[int, int] = (randrange(self.size), randrange(self.size))
+            if cell not in self.tried:
+                return cell
+
+    def remove(self, cell: tuple[int, int]) -> None:
+        if self.pool is not None:
+            self.pool.remove(cell)
+            return
+
+        self.tried.add(cell)
+        if len(self.tried) > self.size * self.size * SparseCellPool.DENSE_RATIO:
+            self.pool = CellPool(self.size)
+            for tried in self.tried:
+                self.pool.remove(tried)
+            self.tried = set()
+
+    def draw(self) -> tuple[int, int]:
+        cell: tuple[int, int] = self.random()
+        self.remove(cell)
+        return cell
+
+
+class RandomMachine:
+    def __init__(self, boardSize: int) -> None:
+        self.untried: CellPool | SparseCellPool = CellPool.create(boardSize)
+
+    def getShot(self) -> tuple[int, int]:
+        return self.untried.random()
+
+    def record(self, x: int, y: int, result: ShotResult) -> None:
+        self.untried.remove((x, y))
+
+
+class DensityMachine:
+    def __init__(self, boardSize: int, fleet: list[ShipType]) -> None:
+        self.boardSize: int = boardSize
+        self.untried: CellPool = CellPool(boardSize)
+        self.remaining: dict[int, int] = {}
+        for type in fleet:
+            self.remaining[int(type)] = self.remaining.get(int(type), 0) + 1
+
+        self.open: list[list[bool]] = [[True] * boardSize for _ in range(boardSize)]
+        self.hits: set[tuple[int, int]] = set()
+
+    def isValidCoords(self, x: int, y: int) -> bool:
+        return x >= 0 and x < self.boardSize and y >= 0 and y < self.boardSize
+
+    def getNeighbors(self, x: int, y: int) -> list[tuple[int, int]]:
+        neighbors: list[tuple[int, int]] = []
+        for i in range(4):
+            nx: int = x + (1, -1, 0, 0)[i]
+            ny: int = y + (0, 0, -1, 1)[i]
+            if self.isValidCoords(nx, ny):
+                neighbors.append((nx, ny))
+        return neighbors
+
+    def sink(self, x: int, y: int) -> None:
+        ship: list[tuple[int, int]] = [(x, y)]
+        self.hits.discard((x, y))
+        for cell in ship:
+            for neighbor in self.getNeighbors(*cell):
+                if neighbor in self.hits:
+                    self.hits.discard(neighbor)
+                    ship.append(neighbor)
+
+        for cx, cy in ship:
+            self.open[cx][cy] = False
+            for nx, ny in self.getNeighbors(cx, cy):
+                self.open[nx][ny] = False
+
+        length: int = len(ship)
+        if self.remaining.get(length):
+            self.remaining[length] -= 1
+            if not self.remaining[length]:
+                del self.remaining[length]
+
+    def record(self, x: int, y: int, result: ShotResult) -> None:
+        self.untried.remove((x, y))
+        if result == ShotResult.Miss:
+            self.open[x][y] = False
+        elif result == ShotResult.Hit:
+            self.hits.add((x, y))
+        else:
+            self.sink(x, y)
+
+    def getDensityVectorized(self, target: bool):
+        size: int = self.boardSize
+        target = target and bool(self.hits)
+        closed = ~numpy.array(self.open, dtype=bool)
+        hits = numpy.zeros((size, size), dtype=numpy.int64)
+        for x, y in self.hits:
+            hits[x, y] = 1
+
+        density = numpy.zeros((size, size), dtype=numpy.float64)
+        for axis in (0, 1):
+            closedSums = numpy.insert(
+                numpy.cumsum(closed, axis=axis, dtype=numpy.int64), 0, 0, axis=axis
+            )
+            hitSums = numpy.insert(numpy.cumsum(hits, axis=axis), 0, 0, axis=axis)
+
+            for length, count in self.remaining.items():
+                if length > size or (axis == 1 and length == 1):
+                    continue
+                starts: int = size - length + 1
+                lower = numpy.arange(starts)
+                upper = lower + length
+                windowClosed = numpy.take(closedSums, upper, axis=axis) - numpy.take(
+                    closedSums, lower, axis=axis
+                )
+                weights = (windowClosed == 0).astype(numpy.float64) * count
+                if target:
+                    weights *= numpy.take(hitSums, upper, axis=axis) - numpy.take(
+                        hitSums, lower, axis=axis
+                    )
+
+                for i in range(length):
+                    if axis == 0:
+                        density[i : i + starts, :] += weights
+                    else:
+                        density[:, i : i + starts] += weights
+
+        density[hits == 1] = 0
+        if target and not density.any():
+            return self.getDensityVectorized(False)
+        return density
+
+    def getDensityLoop(self, target: bool) -> list[list[float]]:
+        size: int = self.boardSize
+        density: list[list[float]] = [[0.0] * size for _ in range(size)]
+        target = target and bool(self.hits)
+
+        for length, count in self.remaining.items():
+            if length > size:
+                continue
+            for orientation in (0, 1) if length > 1 else (0,):
+                for a in range(size - length + 1):
+                    for b in range(size):
+                        cells: list[tuple[int, int]] = (
+                            [(a + i, b) for i in range(length)]
+                            if orientation == 0
+                            else [(b, a + i) for i in range(length)]
+                        )
+                        if not all(self.open[x][y] for x, y in cells):
+                            continue
+                        weight: float = count
+                        if target:
+                            weight *= sum(1 for cell in cells if cell in self.hits)
+                            if not weight:
+                                continue
+                        for x, y in cells:
+                            density[x][y] += weight
+
+        for x, y in self.hits:
+            density[x][y] = 0.0
+        if target and not any(any(row) for row in density):
+            return self.getDensityLoop(False)
+        return density
+
+    def getShot(self) -> tuple[int, int]:
+        if loadNumpy():
+            density = self.getDensityVectorized(True)
+            best: float = float(density.max())
+            if best <= 0:
+                return self.untried.random()
+            return divmod(
+                int(choice(numpy.flatnonzero(density == best))), self.boardSize
+            )
+
+        density: list[list[float]] = self.getDensityLoop(True)
+        best: float = 0.0
+        cells: list[tuple[int, int]] = []
+        for x in range(self.boardSize):
+            for y in range(self.boardSize):
+                value: float = density[x][y]
+                if value <= 0 or value < best:
+                    continue
+                if value > best:
+                    best = value
+                    cells = []
+                cells.append((x, y))
+
+        return choice(cells) if len(cells) else self.untried.random()
+
+
+class MonteCarloMachine(DensityMachine):
+    BUDGET = 0.25
+    MAX_SAMPLES = 20_000
+    PLACEMENT_ATTEMPTS = 50
+    GRACE = 0.05
+    executor: "ProcessPoolExecutor | None" = None
+    executorWorkers: int = 0
+    executorLock = Lock()
+
+    @staticmethod
+    def getDefaultWorkers() -> int:
+        return max((cpu_count() or 1) - 1, 0)
+
+    @staticmethod
+    def getExecutor(workers: int) -> "ProcessPoolExecutor":
+        from concurrent.futures import ProcessPoolExecutor
+
+        with MonteCarloMachine.executorLock:
+            if (
+                MonteCarloMachine.executor is None
+                or MonteCarloMachine.executorWorkers != workers
+            ):
+                if MonteCarloMachine.executor is not None:
+                    MonteCarloMachine.executor.shutdown(
+                        wait=False, cancel_futures=True
+                    )
+                MonteCarloMachine.executor = ProcessPoolExecutor(workers)
+                MonteCarloMachine.executorWorkers = workers
+            return MonteCarloMachine.executor
+
+    @staticmethod
+    def canPlace(
+        cells: list[tuple[int, int]],
+        size: int,
+        open: list[list[bool]],
+        blocked: set[tuple[int, int]],
+        hits: set[tuple[int, int]],
+    ) -> bool:
+        for x, y in cells:
+            if x < 0 or x >= size or y < 0 or y >= size:
+                return False
+            if not open[x][y] or (x, y) in blocked:
+                return False
+            for i in range(4):
+                neighbor: tuple[int, int] = (
+                    x + (1, -1, 0, 0)[i],
+                    y + (0, 0, -1, 1)[i],
+                )
+                if neighbor in hits and neighbor not in cells:
+                    return False
+        return not all(cell in hits for cell in cells)
+
+    @staticmethod
+    def block(cells: list[tuple[int, int]], blocked: set[tuple[int, int]]) -> None:
+        for x, y in cells:
+            blocked.add((x, y))
+            for i in range(4):
+                blocked.add((x + (1, -1, 0, 0)[i], y + (0, 0, -1, 1)[i]))
+
+    @staticmethod
+    def sampleLayout(
+        rng: Random,
+        size: int,
+        lengths: list[int],
+        open: list[list[bool]],
+        hits: set[tuple[int, int]],
+    ) -> list[tuple[int, int]] | None:
+        remaining: list[int] = list(lengths)
+        blocked: set[tuple[int, int]] = set()
+        uncovered: set[tuple[int, int]] = set(hits)
+        layout: list[tuple[int, int]] = []
+
+        while len(uncovered):
+            hx, hy = min(uncovered)
+            candidates: list[tuple[int, list[tuple[int, int]]]] = []
+            for index, length in enumerate(remaining):
+                for offset in range(length):
+                    for cells in (
+                        [(hx - offset + i, hy) for i in range(length)],
+                        [(hx, hy - offset + i) for i in range(length)],
+                    ):
+                        if MonteCarloMachine.canPlace(
+                            cells, size, open, blocked, hits
+                        ):
+                            candidates.append((index, cells))
+            if not len(candidates):
+                return None
+            index, cells = rng.choice(candidates)
+            remaining.pop(index)
+            MonteCarloMachine.block(cells, blocked)
+            uncovered.difference_update(cells)
+            layout.extend(cells)
+
+        for length in sorted(remaining, reverse=True):
+            for _ in range(MonteCarloMachine.PLACEMENT_ATTEMPTS):
+                if rng.random() < 0.5:
+                    x, y = rng.randrange(size - length + 1), rng.randrange(size)
+                    cells = [(x + i, y) for i in range(length)]
+                else:
+                    x, y = rng.randrange(size), rng.randrange(size - length + 1)
+                    cells = [(x, y + i) for i in range(length)]
+                if MonteCarloMachine.canPlace(cells, size, open, blocked, hits):
+                    break
+            else:
+                return None
+            MonteCarloMachine.block(cells, blocked)
+            layout.extend(cells)
+
+        return layout
+
+    @staticmethod
+    def sampleLayouts(
+        size: int,
+        lengths: list[int],
+        open: list[list[bool]],
+        hits: set[tuple[int, int]],
+        deadline: float,
+        samples: int,
+        seed: int,
+    ) -> tuple[list[int], int]:
+        rng = Random(seed)
+        counts: list[int] = [0] * (size * size)
+        accepted: int = 0
+        for _ in range(samples):
+            if time() >= deadline:
+                break
+            layout: list[tuple[int, int]] | None = MonteCarloMachine.sampleLayout(
+                rng, size, lengths, open, hits
+            )
+            if layout is None:
+                continue
+            accepted += 1
+            for x, y in layout:
+                counts[x * size + y] += 1
+        return counts, accepted
+
+    def __init__(
+        self,
+        boardSize: int,
+        fleet: list[ShipType],
+        workers: int | None = None,
+        budget: float = BUDGET,
+        samples: int = MAX_SAMPLES,
+    ) -> None:
+        super().__init__(boardSize, fleet)
+        self.workers: int = (
+            MonteCarloMachine.getDefaultWorkers() if workers is None else workers
+        )
+        self.budget: float = budget
+        self.samples: int = samples
+        self.local: bool = True
+        self.lastSamples: int = 0
+
+    def getLengths(self) -> list[int]:
+        lengths: list[int] = []
+        for length, count in self.remaining.items():
+            lengths.extend([length] * count)
+        return lengths
+
+    def getShot(self) -> tuple[int, int]:
+        deadline: float = time() + self.budget
+        args = (self.boardSize, self.getLengths(), self.open, self.hits, deadline)
+        futures: "list[Future[tuple[list[int], int]]]" = []
+        local: bool = self.local or not self.workers
+        share: int = self.samples // (self.workers + local)
+        if self.workers:
+            executor: "ProcessPoolExecutor" = MonteCarloMachine.getExecutor(
+                self.workers
+            )
+            futures = [
+                executor.submit(
+                    MonteCarloMachine.sampleLayouts, *args, share, randrange(1 << 30)
+                )
+                for _ in range(self.workers)
+            ]
+
+        counts: list[int] = [0] * (self.boardSize * self.boardSize)
+        accepted: int = 0
+        if local:
+            counts, accepted = MonteCarloMachine.sampleLayouts(
+                *args, self.samples - share * self.workers, randrange(1 << 30)
+            )
+        from concurrent.futures import wait
+
+        done, _ = wait(
+            futures, timeout=max(deadline - time(), 0) + MonteCarloMachine.GRACE
+        )
+        for future in done:
+            workerCounts, workerAccepted = future.result()
+            accepted += workerAccepted
+            for i, count in enumerate(workerCounts):
+                counts[i] += count
+
+        self.lastSamples = accepted
+        best: int = 0
+        cells: list[tuple[int, int]] = []
+        for cell in range(self.boardSize * self.boardSize):
+            coords: tuple[int, int] = divmod(cell, self.boardSize)
+            if counts[cell] < best or coords not in self.untried:
+                continue
+            if counts[cell] > best:
+                best = counts[cell]
+                cells = []
+            cells.append(coords)
+
+        if not best:
+            return super().getShot()
+        return choice(cells)
+
+
+class MachineDifficulty(IntEnum):
+    Easy = enumAuto(0)
+    Hard = enumAuto()
+    Expert = enumAuto()
+
+    def create(
+        self, boardSize: int, fleet: list[ShipType], workers: int | None = None
+    ) -> "Machine":
+        if self == MachineDifficulty.Easy:
+            return RandomMachine(boardSize)
+        if self == MachineDifficulty.Hard:
+            return DensityMachine(boardSize, fleet)
+        return MonteCarloMachine(boardSize, fleet, workers)
+
+
+Machine = RandomMachine | DensityMachine | MonteCarloMachine
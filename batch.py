@@ -0,0 +1,255 @@
+from ai import MachineDifficulty
+from board import ShipType
+from engine import PlayerType
+from placement import Placer
+from random import Random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class RandomPolicy:
+    def __init__(self) -> None:
+        self.batch: BatchEngine | None = None
+        self.order = None
+        self.cursor = None
+
+    def reset(self, batch: "BatchEngine") -> None:
+        self.batch = batch
+        self.order = (
+            batch.rng.random((batch.games, 2, batch.boardSize * batch.boardSize))
+            .argsort(axis=2)
+            .astype(numpy.int32)
+        )
+        self.cursor = numpy.zeros((batch.games, 2), dtype=numpy.intp)
+
+    def choose(self, batch: "BatchEngine", games, target: int):
+        if self.batch is not batch:
+            self.reset(batch)
+
+        shots = batch.shots.reshape(batch.games, 2, -1)
+        while True:
+            cells = self.order[games, target, self.cursor[games, target]]
+            shot = shots[games, target, cells]
+            if not shot.any():
+                break
+            self.cursor[games[shot], target] += 1
+        self.cursor[games, target] += 1
+        return numpy.divmod(cells, batch.boardSize)
+
+
+class DensityPolicy:
+    @staticmethod
+    def getSlice(array, start: int, stop: int, axis: int):
+        if axis == 1:
+            return array[:, start:stop, :]
+        return array[:, :, start:stop]
+
+    @staticmethod
+    def addWindows(density, weights, length: int, axis: int) -> None:
+        starts: int = weights.shape[axis]
+        for i in range(length):
+            DensityPolicy.getSlice(density, i, i + starts, axis)[...] += weights
+
+    @staticmethod
+    def getWindowSums(mask, length: int, axis: int):
+        starts: int = mask.shape[axis] - length + 1
+        sums = DensityPolicy.getSlice(mask, 0, starts, axis).astype(numpy.int32)
+        for i in range(1, length):
+            sums += DensityPolicy.getSlice(mask, i, i + starts, axis)
+        return sums
+
+    def choose(self, batch: "BatchEngine", games, target: int):
+        count: int = len(games)
+        ships = batch.ships[games, target]
+        shots = batch.shots[games, target]
+        health = batch.health[games, target]
+
+        occupied = ships > 0
+        shipHealth = numpy.take_along_axis(
+            health, numpy.maximum(ships - 1, 0).reshape(count, -1), axis=1
+        ).reshape(ships.shape)
+        sunk = occupied & (shipHealth == 0)
+        hits = shots & occupied & ~sunk
+        closed = (shots & ~occupied) | BatchEngine.dilate(sunk)
+
+        hunt = numpy.zeros(ships.shape, dtype=numpy.int32)
+        aim = numpy.zeros(ships.shape, dtype=numpy.int32)
+        alive = health > 0
+        for length in numpy.unique(batch.lengths):
+            remaining = (alive & (batch.lengths == length)).sum(axis=1)
+            if not remaining.any() or length > batch.boardSize:
+                continue
+            for axis in (1, 2):
+                if axis == 2 and length == 1:
+                    continue
+                free = DensityPolicy.getWindowSums(closed, length, axis) == 0
+                weights = free * remaining[:, None, None]
+                DensityPolicy.addWindows(hunt, weights, length, axis)
+                DensityPolicy.addWindows(
+                    aim,
+                    weights * DensityPolicy.getWindowSums(hits, length, axis),
+                    length,
+                    axis,
+                )
+
+        aim[shots] = 0
+        targeting = aim.reshape(count, -1).any(axis=1)
+        density = numpy.where(targeting[:, None, None], aim, hunt).astype(
+            numpy.float64
+        )
+        density += batch.rng.random(density.shape) * 0.5
+        density[shots] = -1
+        return numpy.divmod(density.reshape(count, -1).argmax(axis=1), batch.boardSize)
+
+
+class BatchEngine:
+    MAX_ATTEMPTS = 100
+    POLICIES = {
+        MachineDifficulty.Easy: RandomPolicy,
+        MachineDifficulty.Hard: DensityPolicy,
+    }
+
+    @staticmethod
+    def createPolicy(difficulty: MachineDifficulty) -> RandomPolicy | DensityPolicy:
+        policy: type[RandomPolicy | DensityPolicy] | None = BatchEngine.POLICIES.get(
+            difficulty
+        )
+        if policy is None:
+            raise ValueError(f"The batch engine can't play {difficulty.name}")
+        return policy()
+
+    @staticmethod
+    def dilate(mask):
+        result = mask.copy()
+        result[:, 1:, :] |= mask[:, :-1, :]
+        result[:, :-1, :] |= mask[:, 1:, :]
+        result[:, :, 1:] |= mask[:, :, :-1]
+        result[:, :, :-1] |= mask[:, :, 1:]
+        return result
+
+    def __init__(
+        self,
+        games: int,
+        boardSize: int,
+        fleet: list[ShipType],
+        seed: int | None = None,
+    ) -> None:
+        if numpy is None:
+            raise RuntimeError("The batch engine requires numpy")
+
+        self.games: int = games
+        self.boardSize: int = boardSize
+        self.fleet: list[ShipType] = sorted(fleet, reverse=True)
+        self.rng = numpy.random.default_rng(seed)
+        self.lengths = numpy.array(
+            [int(type) for type in self.fleet], dtype=numpy.int16
+        )
+
+        shape: tuple[int, int, int, int] = (games, 2, boardSize, boardSize)
+        self.ships = numpy.zeros(shape, dtype=numpy.int16)
+        self.shots = numpy.zeros(shape, dtype=bool)
+        self.health = numpy.tile(self.lengths, (games, 2, 1))
+        self.remaining = numpy.full((games, 2), len(self.fleet), dtype=numpy.int16)
+        self.shotsFired = numpy.zeros((games, 2), dtype=numpy.int32)
+        self.turn = numpy.zeros(games, dtype=numpy.int8)
+        self.winner = numpy.full(games, -1, dtype=numpy.int8)
+        self.steps: int = 0
+
+    def placeFleet(self, player: PlayerType) -> None:
+        size: int = self.boardSize
+        blocked = numpy.zeros((self.games, size, size), dtype=bool)
+        failed = numpy.zeros(self.games, dtype=bool)
+
+        for index, length in enumerate(self.lengths.tolist()):
+            pending = numpy.flatnonzero(~failed)
+            offsets = numpy.arange(length)
+            for _ in range(BatchEngine.MAX_ATTEMPTS):
+                if not len(pending):
+                    break
+                vertical = self.rng.random(len(pending)) < 0.5
+                a = self.rng.integers(0, size - length + 1, len(pending))[:, None]
+                b = self.rng.integers(0, size, len(pending))[:, None]
+                xs = numpy.where(vertical[:, None], b, a + offsets)
+                ys = numpy.where(vertical[:, None], a + offsets, b)
+                free = ~blocked[pending[:, None], xs, ys].any(axis=1)
+
+                placed = pending[free][:, None]
+                xs, ys = xs[free], ys[free]
+                self.ships[placed, player, xs, ys] = index + 1
+                for dx, dy in ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)):
+                    blocked[
+                        placed,
+                        numpy.clip(xs + dx, 0, size - 1),
+                        numpy.clip(ys + dy, 0, size - 1),
+                    ] = True
+                pending = pending[~free]
+            failed[pending] = True
+
+        for game in numpy.flatnonzero(failed).tolist():
+            self.ships[game, player] = 0
+            rng = Random(int(self.rng.integers(1 << 62)))
+            for index, ship in enumerate(Placer(size, self.fleet, rng=rng).solve()):
+                for x, y in ship.coords:
+                    self.ships[game, player, x, y] = index + 1
+
+    def placeFleets(self) -> None:
+        for player in PlayerType.values():
+            self.placeFleet(player)
+
+    def setFirstPlayers(self, firstPlayers) -> None:
+        self.turn[:] = firstPlayers
+
+    @property
+    def live(self):
+        return numpy.flatnonzero(self.winner < 0)
+
+    def step(self, policies: tuple[RandomPolicy | DensityPolicy, ...]) -> int:
+        games = self.live
+        if not len(games):
+            return 0
+        self.steps += 1
+
+        shooters = self.turn[games]
+        targets = 1 - shooters
+        xs = numpy.zeros(len(games), dtype=numpy.intp)
+        ys = numpy.zeros(len(games), dtype=numpy.intp)
+        for player in PlayerType.values():
+            selected = shooters == player
+            if selected.any():
+                xs[selected], ys[selected] = policies[player].choose(
+                    self, games[selected], 1 - player
+                )
+
+        if self.shots[games, targets, xs, ys].any():
+            raise ValueError("A policy shot an already shot cell")
+        self.shots[games, targets, xs, ys] = True
+        self.shotsFired[games, shooters] += 1
+
+        ships = self.ships[games, targets, xs, ys]
+        hit = ships > 0
+        hitGames, hitTargets, hitShips = games[hit], targets[hit], ships[hit] - 1
+        self.health[hitGames, hitTargets, hitShips] -= 1
+        sunk = self.health[hitGames, hitTargets, hitShips] == 0
+        self.remaining[hitGames[sunk], hitTargets[sunk]] -= 1
+
+        missed = games[~hit]
+        self.turn[missed] = 1 - self.turn[missed]
+
+        won = self.remaining[games, targets] == 0
+        self.winner[games[won]] = shooters[won]
+        return len(games)
+
+    def run(self, policies: tuple[RandomPolicy | DensityPolicy, ...]) -> None:
+        while self.step(policies):
+            pass
+
+    def getResults(self) -> list[tuple[PlayerType, int]]:
+        winners = self.winner.astype(numpy.intp)
+        fired = self.shotsFired[numpy.arange(self.games), winners]
+        return [
+            (PlayerType(winner), shots)
+            for winner, shots in zip(winners.tolist(), fired.tolist())
+        ]
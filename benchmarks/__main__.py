@@ -0,0 +1,6 @@
+from benchmarks.cases import Cases
+from benchmarks.harness import Harness
+from sys import argv, exit
+
+if __name__ == "__main__":
+    exit(Harness.main(Cases.create(), argv[1:]))
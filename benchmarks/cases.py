@@ -0,0 +1,323 @@
+from benchmarks.harness import Case
+from board import BoardType
+from ai import MachineDifficulty, MonteCarloMachine, loadNumpy
+from engine import Engine, PlayerType, ShipType
+from fleets import Fleets
+from game import Game
+from lang import lang
+from layouts import LayoutPool
+from os import path
+from placement import Packer
+from random import seed as seedRandom
+from session import Action, ActionType, Session
+from settings import Settings
+from shutil import rmtree
+from subprocess import run
+from tempfile import mkdtemp
+from tournament import Tournament
+import sys
+
+
+class Cases:
+    ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+    CONFIG_FILE = Settings.CONFIG_FILE
+    STARTUP_BUDGET = 0.1
+    DISPLAY_SIZES = (10, 15, 20)
+    FRAMES = 100
+    MESSAGES = 10_000
+    SETTINGS_WRITES = 50
+    GAMES = 10
+    EXPERT_GAMES = 2
+    EXPERT_BUDGET = 0.01
+    EXPERT_SAMPLES = 200
+    BATCH_GAMES = 1000
+    FORKS = 1000
+    SESSIONS = 1000
+    SESSION_MEMORY_BUDGET = 6 * 1024
+    FLEETS = ("A1B1S2C1", "B1S2C3P4", "A2B2S3C3P4")
+    FIT_BUDGET = 0.001
+    UNDECIDED_FIT_BUDGET = 2.0
+
+    @staticmethod
+    def createEngine(
+        boardSize: int,
+        shipsAmount: int,
+        boardType: BoardType,
+        fleet: list[ShipType] | None = None,
+    ) -> Engine:
+        seedRandom(boardSize * 1_000 + shipsAmount)
+        return Engine(boardSize, shipsAmount, PlayerType.Human, boardType, fleet)
+
+    @staticmethod
+    def placement() -> list[Case]:
+        cases: list[Case] = []
+        for boardSize in Game.BOARD_SIZE_RANGE:
+            for shipsAmount in Game.shipsAmountRange(boardSize):
+                cases.append(
+                    Case(
+                        f"placement/{boardSize}x{boardSize}/{shipsAmount}",
+                        Engine.placeMachineShips,
+                        lambda n=boardSize, s=shipsAmount: Cases.createEngine(
+                            n, s, BoardType.List
+                        ),
+                    )
+                )
+        for boardSize in Cases.DISPLAY_SIZES:
+            for spec in Cases.FLEETS:
+                cases.append(
+                    Case(
+                        f"placement/{boardSize}x{boardSize}/{spec}",
+                        Engine.placeMachineShips,
+                        lambda n=boardSize, f=Fleets.parseSpec(spec): (
+                            Cases.createEngine(n, len(f), BoardType.List, f)
+                        ),
+                    )
+                )
+        return cases
+
+    @staticmethod
+    def createLayoutPool() -> LayoutPool:
+        layouts = LayoutPool(seed=0)
+        layouts.wait(20, [ShipType.Submarine] * 20)
+        return layouts
+
+    @staticmethod
+    def takeLayouts(layouts: LayoutPool) -> None:
+        try:
+            for _ in range(layouts.size):
+                layouts.take(20, [ShipType.Submarine] * 20)
+        finally:
+            layouts.stop()
+
+    @staticmethod
+    def getFitFleets() -> list[tuple[int, list[ShipType]]]:
+        fleets: list[tuple[int, list[ShipType]]] = []
+        for boardSize in Game.BOARD_SIZE_RANGE:
+            for spec in Cases.FLEETS:
+                fleets.append((boardSize, Fleets.parseSpec(spec) or []))
+            for shipsAmount in Game.shipsAmountRange(boardSize):
+                fleets.append((boardSize, [ShipType.Submarine] * shipsAmount))
+        return fleets
+
+    @staticmethod
+    def checkFits(fleets: list[tuple[int, list[ShipType]]]) -> None:
+        Packer.LAYOUTS.clear()
+        for boardSize, fleet in fleets:
+            Fleets.canFit(boardSize, fleet)
+
+    @staticmethod
+    def checkUndecidedFit(_: None) -> None:
+        Packer.LAYOUTS.clear()
+        Fleets.canFit(10, [ShipType.Submarine] * 16)
+
+    @staticmethod
+    def resolveAll(engine: Engine) -> None:
+        for x in range(engine.boardSize):
+            for y in range(engine.boardSize):
+                engine.resolveShot(PlayerType.Machine, x, y)
+
+    @staticmethod
+    def createFleetEngine(boardType: BoardType) -> Engine:
+        engine: Engine = Cases.createEngine(20, 20, boardType)
+        engine.placeMachineShips()
+        return engine
+
+    @staticmethod
+    def shots() -> list[Case]:
+        return [
+            Case(
+                f"shots/{boardType.name.lower()}",
+                Cases.resolveAll,
+                lambda t=boardType: Cases.createFleetEngine(t),
+                20 * 20,
+            )
+            for boardType in BoardType.values()
+        ]
+
+    @staticmethod
+    def forkAndFire(engine: Engine) -> None:
+        for i in range(Cases.FORKS):
+            engine.fork().fire(PlayerType.Human, *divmod(i % 400, 20))
+
+    @staticmethod
+    def forks() -> list[Case]:
+        return [
+            Case(
+                f"fork/{boardType.name.lower()}",
+                Cases.forkAndFire,
+                lambda t=boardType: Cases.createFleetEngine(t),
+                Cases.FORKS,
+            )
+            for boardType in BoardType.values()
+        ]
+
+    @staticmethod
+    def createGame(boardSize: int, boardType: BoardType) -> Game:
+        seedRandom(boardSize)
+        game = Game(boardSize, boardSize // 2, PlayerType.Human, boardType=boardType)
+        game.placeRandomShips(PlayerType.Human)
+        game.placeMachineShips()
+        return game
+
+    @staticmethod
+    def buildFrames(game: Game) -> None:
+        for _ in range(Cases.FRAMES):
+            game.getFrame()
+
+    @staticmethod
+    def display() -> list[Case]:
+        return [
+            Case(
+                f"display/{boardType.name.lower()}/{boardSize}",
+                Cases.buildFrames,
+                lambda n=boardSize, t=boardType: Cases.createGame(n, t),
+                Cases.FRAMES,
+            )
+            for boardType in BoardType.values()
+            for boardSize in Cases.DISPLAY_SIZES
+        ]
+
+    @staticmethod
+    def formatMessages(_: None) -> None:
+        for i in range(Cases.MESSAGES // 2):
+            lang.getMessage("gameName")
+            lang.getMessage("createShipInput", i, "Submarine", 3, "H|V")
+
+    @staticmethod
+    def createSettings() -> Settings:
+        Settings.CONFIG_FILE = path.join(mkdtemp(), "battleship.properties")
+        return Settings({"lang": "en"})
+
+    @staticmethod
+    def writeSettings(settings: Settings) -> None:
+        try:
+            for i in range(Cases.SETTINGS_WRITES):
+                settings.setValue("lang", "es" if i % 2 else "en")
+        finally:
+            rmtree(path.dirname(Settings.CONFIG_FILE))
+            Settings.CONFIG_FILE = Cases.CONFIG_FILE
+
+    @staticmethod
+    def playGames(difficulties: tuple[MachineDifficulty, MachineDifficulty]) -> None:
+        seedRandom(0)
+        for i in range(Cases.GAMES):
+            Tournament.playGame(10, 5, PlayerType(i % 2), difficulties)
+
+    @staticmethod
+    def games() -> list[Case]:
+        return [
+            Case(
+                f"games/{difficulty.name.lower()}",
+                Cases.playGames,
+                lambda d=difficulty: (d, d),
+                Cases.GAMES,
+            )
+            for difficulty in MachineDifficulty.values()
+            if difficulty != MachineDifficulty.Expert
+        ]
+
+    @staticmethod
+    def playExpertGames(_: None) -> None:
+        seedRandom(0)
+        for i in range(Cases.EXPERT_GAMES):
+            engine = Engine(10, 5, PlayerType(i % 2), BoardType.Bit)
+            engine.placeRandomShips(PlayerType.Human)
+            engine.placeRandomShips(PlayerType.Machine)
+            players = (
+                MonteCarloMachine(
+                    10, engine.fleet, 0, Cases.EXPERT_BUDGET, Cases.EXPERT_SAMPLES
+                ),
+                MachineDifficulty.Hard.create(10, engine.fleet),
+            )
+            while engine.winner is None:
+                turn: PlayerType = engine.turn
+                x, y = players[turn].getShot()
+                players[turn].record(x, y, engine.fire(turn, x, y))
+
+    @staticmethod
+    def playBatch(difficulty: MachineDifficulty) -> None:
+        from batch import BatchEngine
+
+        batch = BatchEngine(
+            Cases.BATCH_GAMES, 10, Engine(10, 5, PlayerType.Human).fleet, 0
+        )
+        batch.placeFleets()
+        batch.setFirstPlayers([i % 2 for i in range(Cases.BATCH_GAMES)])
+        policy = BatchEngine.createPolicy(difficulty)
+        batch.run((policy, policy))
+
+    @staticmethod
+    def batchGames() -> list[Case]:
+        if not loadNumpy():
+            return []
+        from batch import BatchEngine
+
+        return [
+            Case(
+                f"games/batch/{difficulty.name.lower()}",
+                Cases.playBatch,
+                lambda d=difficulty: d,
+                Cases.BATCH_GAMES,
+            )
+            for difficulty in BatchEngine.POLICIES
+        ]
+
+    @staticmethod
+    def createSession() -> Session:
+        session = Session(10, 5, PlayerType.Human, MachineDifficulty.Easy)
+        session.step(PlayerType.Human, Action(ActionType.AutoPlace))
+        return session
+
+    @staticmethod
+    def hostSessions(_: Session) -> list[Session]:
+        seedRandom(0)
+        return [Cases.createSession() for _ in range(Cases.SESSIONS)]
+
+    @staticmethod
+    def importMain(_: None) -> None:
+        run([sys.executable, "-c", "import main"], cwd=Cases.ROOT, check=True)
+
+    @staticmethod
+    def create() -> list[Case]:
+        return [
+            Case("startup", Cases.importMain, budget=Cases.STARTUP_BUDGET),
+            *Cases.placement(),
+            *Cases.shots(),
+            *Cases.forks(),
+            *Cases.display(),
+            Case(
+                "placement/pool/20x20/20",
+                Cases.takeLayouts,
+                Cases.createLayoutPool,
+                LayoutPool.SIZE,
+            ),
+            Case(
+                "fleets/canFit",
+                Cases.checkFits,
+                Cases.getFitFleets,
+                len(Cases.getFitFleets()),
+                budget=Cases.FIT_BUDGET * len(Cases.getFitFleets()),
+            ),
+            Case(
+                "fleets/canFit/undecided",
+                Cases.checkUndecidedFit,
+                budget=Cases.UNDECIDED_FIT_BUDGET,
+            ),
+            Case("lang/getMessage", Cases.formatMessages, ops=Cases.MESSAGES),
+            Case(
+                "settings/setValue",
+                Cases.writeSettings,
+                Cases.createSettings,
+                Cases.SETTINGS_WRITES,
+            ),
+            *Cases.games(),
+            Case("games/expert", Cases.playExpertGames, ops=Cases.EXPERT_GAMES),
+            *Cases.batchGames(),
+            Case(
+                "memory/session",
+                Cases.hostSessions,
+                Cases.createSession,
+                Cases.SESSIONS,
+                memoryBudget=Cases.SESSION_MEMORY_BUDGET,
+            ),
+        ]
@@ -0,0 +1,200 @@
+from argparse import ArgumentParser
+from gc import collect
+from json import dump, load
+from platform import machine, python_version
+from statistics import median
+from time import perf_counter, time
+from typing import Any, Callable
+import tracemalloc
+
+
+class Case:
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Any], Any],
+        setup: Callable[[], Any] | None = None,
+        ops: int = 1,
+        repeat: int = 5,
+        budget: float | None = None,
+        memoryBudget: int | None = None,
+    ) -> None:
+        self.name: str = name
+        self.run: Callable[[Any], Any] = run
+        self.setup: Callable[[], Any] | None = setup
+        self.ops: int = ops
+        self.repeat: int = repeat
+        self.budget: float | None = budget
+        self.memoryBudget: int | None = memoryBudget
+
+    def measure(self, repeat: int | None = None) -> "CaseResult":
+        timings: list[float] = []
+        for _ in range(repeat or self.repeat):
+            state: Any = self.setup() if self.setup is not None else None
+            start: float = perf_counter()
+            self.run(state)
+            timings.append(perf_counter() - start)
+        result = CaseResult(self.name, median(timings), min(timings), self.ops)
+        if self.memoryBudget is not None:
+            result.memory = self.measureMemory()
+        return result
+
+    def measureMemory(self) -> float:
+        state: Any = self.setup() if self.setup is not None else None
+        collect()
+        tracemalloc.start()
+        try:
+            kept: Any = self.run(state)
+            collect()
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del kept
+        return current / self.ops
+
+    def isOverBudget(self, result: "CaseResult") -> bool:
+        return self.budget is not None and result.median > self.budget
+
+    def isOverMemoryBudget(self, result: "CaseResult") -> bool:
+        return (
+            self.memoryBudget is not None
+            and result.memory is not None
+            and result.memory > self.memoryBudget
+        )
+
+
+class CaseResult:
+    def __init__(
+        self,
+        name: str,
+        median: float,
+        best: float,
+        ops: int,
+        memory: float | None = None,
+    ) -> None:
+        self.name: str = name
+        self.median: float = median
+        self.best: float = best
+        self.ops: int = ops
+        self.memory: float | None = memory
+
+    @property
+    def opsPerSecond(self) -> float:
+        return self.ops / self.median if self.median else 0.0
+
+    def toJson(self) -> dict[str, float | int]:
+        data: dict[str, float | int] = {
+            "median": self.median,
+            "best": self.best,
+            "ops": self.ops,
+            "opsPerSecond": self.opsPerSecond,
+        }
+        if self.memory is not None:
+            data["memory"] = self.memory
+        return data
+
+    @staticmethod
+    def fromJson(name: str, data: dict[str, float | int]) -> "CaseResult":
+        memory: float | int | None = data.get("memory")
+        return CaseResult(
+            name,
+            float(data["median"]),
+            float(data["best"]),
+            int(data["ops"]),
+            None if memory is None else float(memory),
+        )
+
+
+class Harness:
+    VERSION = 1
+    THRESHOLD = 0.1
+
+    @staticmethod
+    def run(cases: list[Case], repeat: int | None = None) -> list[CaseResult]:
+        results: list[CaseResult] = []
+        for case in cases:
+            result: CaseResult = case.measure(repeat)
+            results.append(result)
+            line: str = (
+                f"{case.name:<40} {result.median * 1000:>10.3f} ms"
+                f" {result.opsPerSecond:>14.1f} ops/s"
+            )
+            if result.memory is not None:
+                line += f" {result.memory:>10.0f} B/op"
+            if case.isOverBudget(result):
+                line += f"  OVER BUDGET ({case.budget * 1000:.0f} ms)"
+            if case.isOverMemoryBudget(result):
+                line += f"  OVER MEMORY BUDGET ({case.memoryBudget} B/op)"
+            print(line, flush=True)
+        return results
+
+    @staticmethod
+    def save(results: list[CaseResult], filePath: str) -> None:
+        data: dict[str, Any] = {
+            "version": Harness.VERSION,
+            "python": python_version(),
+            "machine": machine(),
+            "createdAt": int(time()),
+            "results": {result.name: result.toJson() for result in results},
+        }
+        with open(filePath, "w", encoding="utf-8") as resultsFile:
+            dump(data, resultsFile, indent=2)
+
+    @staticmethod
+    def load(filePath: str) -> dict[str, CaseResult]:
+        with open(filePath, encoding="utf-8") as resultsFile:
+            data: dict[str, Any] = load(resultsFile)
+        if data.get("version") != Harness.VERSION:
+            raise ValueError(f"Unsupported benchmark results version: {filePath}")
+        return {
+            name: CaseResult.fromJson(name, result)
+            for name, result in data["results"].items()
+        }
+
+    @staticmethod
+    def compare(
+        results: list[CaseResult], baseline: dict[str, CaseResult], threshold: float
+    ) -> list[str]:
+        regressions: list[str] = []
+        print()
+        for result in results:
+            previous: CaseResult | None = baseline.get(result.name)
+            if previous is None or not previous.median:
+                continue
+            ratio: float = result.median / previous.median
+            status: str = ""
+            if ratio > 1 + threshold:
+                status = "REGRESSION"
+                regressions.append(result.name)
+            elif ratio < 1 - threshold:
+                status = "improved"
+            print(f"{result.name:<40} {ratio:>8.2f}x  {status}".rstrip())
+        return regressions
+
+    @staticmethod
+    def main(cases: list[Case], args: list[str]) -> int:
+        parser = ArgumentParser(prog="python -m benchmarks")
+        parser.add_argument("--filter", default="")
+        parser.add_argument("--repeat", type=int, default=None)
+        parser.add_argument("--save", default="")
+        parser.add_argument("--compare", default="")
+        parser.add_argument("--threshold", type=float, default=Harness.THRESHOLD)
+        options = parser.parse_args(args)
+
+        selected: list[Case] = [case for case in cases if options.filter in case.name]
+        results: list[CaseResult] = Harness.run(selected, options.repeat)
+        if options.save:
+            Harness.save(results, options.save)
+
+        failed: bool = any(
+            case.isOverBudget(result) or case.isOverMemoryBudget(result)
+            for case, result in zip(selected, results)
+        )
+        if options.compare:
+            regressions: list[str] = Harness.compare(
+                results, Harness.load(options.compare), options.threshold
+            )
+            if regressions:
+                print(f"{len(regressions)} regression(s) over {options.threshold:.0%}")
+                failed = True
+        return int(failed)
@@ -0,0 +1,346 @@
+from typing import Iterable, Self
+from util import IntEnum, StrEnum, enumAuto
+
+
+class ShipType(IntEnum):
+    Empty = enumAuto(0)
+    Patrol = enumAuto()
+    Cruiser = enumAuto()
+    Submarine = enumAuto()
+    Battleship = enumAuto()
+    Carrier = enumAuto()
+    Hit = enumAuto()
+
+    def __str__(self) -> str:
+        return (".", "P", "C", "S", "B", "A", "x")[self]
+
+
+class PegType(IntEnum):
+    Empty = enumAuto(0)
+    Hit = enumAuto()
+    Miss = enumAuto()
+
+    def __str__(self) -> str:
+        return (".", "x", "o")[self]
+
+
+class ShipOrientation(StrEnum):
+    Horizontal = "H"
+    Vertical = "V"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class Ship:
+    __slots__ = ("x", "y", "type", "orientation", "hits")
+
+    def __init__(self, x: int, y: int, type: ShipType, orientation: ShipOrientation):
+        self.x: int = x
+        self.y: int = y
+        self.type: ShipType = type
+        self.orientation: ShipOrientation = orientation
+        self.hits: int = 0
+
+    @property
+    def length(self) -> int:
+        return int(self.type)
+
+    @property
+    def coords(self) -> list[tuple[int, int]]:
+        x: int = self.x
+        y: int = self.y
+        length: int = int(self.type)
+        if self.orientation == ShipOrientation.Horizontal:
+            start: int = x - length // 2
+            return [(start + i, y) for i in range(length)]
+        start: int = y - length // 2
+        return [(x, start + i) for i in range(length)]
+
+    @property
+    def destroyed(self) -> bool:
+        return self.hits >= self.type
+
+    @property
+    def health(self) -> int:
+        return self.type - self.hits
+
+    def shootAt(self) -> None:
+        self.hits += 1
+
+    def copy(self) -> "Ship":
+        ship = Ship(self.x, self.y, self.type, self.orientation)
+        ship.hits = self.hits
+        return ship
+
+
+class ListBoard:
+    __slots__ = ("size", "ships", "pegs", "ownedRows")
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.ships: list[list[ShipType]] = [
+            [ShipType.Empty] * size for _ in range(size)
+        ]
+        self.pegs: list[list[PegType]] = [[PegType.Empty] * size for _ in range(size)]
+        self.ownedRows: list[bool] = []
+
+    def fork(self) -> Self:
+        board: Self = object.__new__(type(self))
+        for name in ListBoard.__slots__:
+            setattr(board, name, getattr(self, name))
+        board.ships = list(self.ships)
+        board.pegs = list(self.pegs)
+        board.ownedRows = [False] * self.size
+        self.ownedRows = [False] * self.size
+        return board
+
+    def ownRow(self, x: int) -> None:
+        self.ownedRows[x] = True
+        self.ships[x] = list(self.ships[x])
+        self.pegs[x] = list(self.pegs[x])
+
+    def isValidCoords(self, x: int, y: int) -> bool:
+        return x >= 0 and x < self.size and y >= 0 and y < self.size
+
+    def get(self, x: int, y: int) -> ShipType:
+        return ShipType.Hit if self.pegs[x][y] != PegType.Empty else self.ships[x][y]
+
+    def getPeg(self, x: int, y: int) -> PegType:
+        return self.pegs[x][y]
+
+    def hasShip(self, x: int, y: int) -> bool:
+        return self.ships[x][y] != ShipType.Empty
+
+    def isShot(self, x: int, y: int) -> bool:
+        return self.pegs[x][y] != PegType.Empty
+
+    def canPlace(self, coords: Iterable[tuple[int, int]]) -> bool:
+        for x, y in coords:
+            if not self.isValidCoords(x, y) or self.hasShip(x, y):
+                return False
+            for i in range(4):
+                nx: int = x + (1, -1, 0, 0)[i]
+                ny: int = y + (0, 0, -1, 1)[i]
+                if self.isValidCoords(nx, ny) and self.hasShip(nx, ny):
+                    return False
+        return True
+
+    def place(self, coords: Iterable[tuple[int, int]], type: ShipType) -> None:
+        for x, y in coords:
+            if self.ownedRows and not self.ownedRows[x]:
+                self.ownRow(x)
+            self.ships[x][y] = type
+
+    def shoot(self, x: int, y: int) -> bool:
+        if self.ownedRows and not self.ownedRows[x]:
+            self.ownRow(x)
+        hit: bool = self.hasShip(x, y)
+        self.pegs[x][y] = PegType.Hit if hit else PegType.Miss
+        return hit
+
+
+class BitBoard:
+    __slots__ = (
+        "size",
+        "full",
+        "firstRow",
+        "lastRow",
+        "occupied",
+        "blocked",
+        "hits",
+        "misses",
+        "types",
+        "shared",
+    )
+    MASKS: dict[int, tuple[int, int, int]] = {}
+
+    @staticmethod
+    def getMasks(size: int) -> tuple[int, int, int]:
+        masks: tuple[int, int, int] | None = BitBoard.MASKS.get(size)
+        if masks is None:
+            firstRow: int = 0
+            for x in range(size):
+                firstRow |= 1 << x * size
+            masks = ((1 << size * size) - 1, firstRow, firstRow << size - 1)
+            BitBoard.MASKS[size] = masks
+        return masks
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        full, firstRow, lastRow = BitBoard.getMasks(size)
+        self.full: int = full
+        self.firstRow: int = firstRow
+        self.lastRow: int = lastRow
+
+        self.occupied: int = 0
+        self.blocked: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.types: dict[ShipType, int] = {}
+        self.shared: bool = False
+
+    def fork(self) -> Self:
+        self.shared = True
+        board: Self = object.__new__(type(self))
+        for name in BitBoard.__slots__:
+            setattr(board, name, getattr(self, name))
+        return board
+
+    def isValidCoords(self, x: int, y: int) -> bool:
+        return x >= 0 and x < self.size and y >= 0 and y < self.size
+
+    def bit(self, x: int, y: int) -> int:
+        return 1 << x * self.size + y
+
+    def mask(self, coords: Iterable[tuple[int, int]]) -> int | None:
+        mask: int = 0
+        for x, y in coords:
+            if not self.isValidCoords(x, y):
+                return None
+            mask |= 1 << x * self.size + y
+        return mask
+
+    def dilate(self, mask: int) -> int:
+        return (
+            mask
+            | (mask << self.size)
+            | (mask >> self.size)
+            | ((mask << 1) & ~self.firstRow)
+            | ((mask >> 1) & ~self.lastRow)
+        ) & self.full
+
+    def get(self, x: int, y: int) -> ShipType:
+        bit: int = self.bit(x, y)
+        if (self.hits | self.misses) & bit:
+            return ShipType.Hit
+        if not self.occupied & bit:
+            return ShipType.Empty
+        for type, mask in self.types.items():
+            if mask & bit:
+                return type
+        return ShipType.Empty
+
+    def getPeg(self, x: int, y: int) -> PegType:
+        bit: int = self.bit(x, y)
+        if self.hits & bit:
+            return PegType.Hit
+        if self.misses & bit:
+            return PegType.Miss
+        return PegType.Empty
+
+    def hasShip(self, x: int, y: int) -> bool:
+        return bool(self.occupied & self.bit(x, y))
+
+    def isShot(self, x: int, y: int) -> bool:
+        return bool((self.hits | self.misses) & self.bit(x, y))
+
+    def canPlace(self, coords: Iterable[tuple[int, int]]) -> bool:
+        mask: int | None = self.mask(coords)
+        return mask is not None and not mask & self.blocked
+
+    def place(self, coords: Iterable[tuple[int, int]], type: ShipType) -> None:
+        mask: int | None = self.mask(coords)
+        if mask is None:
+            raise ValueError("Coords out of the board")
+        if self.shared:
+            self.shared = False
+            self.types = dict(self.types)
+        self.occupied |= mask
+        self.blocked |= self.dilate(mask)
+        self.types[type] = self.types.get(type, 0) | mask
+
+    def shoot(self, x: int, y: int) -> bool:
+        bit: int = self.bit(x, y)
+        if self.occupied & bit:
+            self.hits |= bit
+            return True
+        self.misses |= bit
+        return False
+
+
+class SparseBoard:
+    __slots__ = ("size", "ships", "hits", "misses", "sharedShips", "sharedShots")
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.ships: dict[tuple[int, int], ShipType] = {}
+        self.hits: set[tuple[int, int]] = set()
+        self.misses: set[tuple[int, int]] = set()
+        self.sharedShips: bool = False
+        self.sharedShots: bool = False
+
+    def fork(self) -> Self:
+        self.sharedShips = self.sharedShots = True
+        board: Self = object.__new__(type(self))
+        for name in SparseBoard.__slots__:
+            setattr(board, name, getattr(self, name))
+        return board
+
+    def isValidCoords(self, x: int, y: int) -> bool:
+        return x >= 0 and x < self.size and y >= 0 and y < self.size
+
+    def get(self, x: int, y: int) -> ShipType:
+        cell: tuple[int, int] = (x, y)
+        if cell in self.hits or cell in self.misses:
+            return ShipType.Hit
+        return self.ships.get(cell, ShipType.Empty)
+
+    def getPeg(self, x: int, y: int) -> PegType:
+        cell: tuple[int, int] = (x, y)
+        if cell in self.hits:
+            return PegType.Hit
+        if cell in self.misses:
+            return PegType.Miss
+        return PegType.Empty
+
+    def hasShip(self, x: int, y: int) -> bool:
+        return (x, y) in self.ships
+
+    def isShot(self, x: int, y: int) -> bool:
+        cell: tuple[int, int] = (x, y)
+        return cell in self.hits or cell in self.misses
+
+    def canPlace(self, coords: Iterable[tuple[int, int]]) -> bool:
+        for x, y in coords:
+            if not self.isValidCoords(x, y) or self.hasShip(x, y):
+                return False
+            for i in range(4):
+                if (x + (1, -1, 0, 0)[i], y + (0, 0, -1, 1)[i]) in self.ships:
+                    return False
+        return True
+
+    def place(self, coords: Iterable[tuple[int, int]], type: ShipType) -> None:
+        if self.sharedShips:
+            self.sharedShips = False
+            self.ships = dict(self.ships)
+        for cell in coords:
+            self.ships[cell] = type
+
+    def shoot(self, x: int, y: int) -> bool:
+        if self.sharedShots:
+            self.sharedShots = False
+            self.hits = set(self.hits)
+            self.misses = set(self.misses)
+        cell: tuple[int, int] = (x, y)
+        if cell in self.ships:
+            self.hits.add(cell)
+            return True
+        self.misses.add(cell)
+        return False
+
+
+class BoardType(StrEnum):
+    List = "list"
+    Bit = "bit"
+    Sparse = "sparse"
+
+    def create(self, size: int) -> "Board":
+        if self == BoardType.Bit:
+            return BitBoard(size)
+        if self == BoardType.Sparse:
+            return SparseBoard(size)
+        return ListBoard(size)
+
+
+Board = ListBoard | BitBoard | SparseBoard
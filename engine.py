@@ -0,0 +1,240 @@
+from board import Board, BoardType, PegType, Ship, ShipOrientation, ShipType
+from placement import Placer
+from profiler import profiler
+from typing import TYPE_CHECKING, Self
+from util import IntEnum, enumAuto
+
+if TYPE_CHECKING:
+    from journal import Journal
+
+
+class PlayerType(IntEnum):
+    Human = enumAuto(0)
+    Machine = enumAuto()
+
+    def opponent(self) -> "PlayerType":
+        return PlayerType.Machine if self == PlayerType.Human else PlayerType.Human
+
+
+class ShotResult(IntEnum):
+    Miss = enumAuto(0)
+    Hit = enumAuto()
+    Sunk = enumAuto()
+
+
+class Engine:
+    def __init__(
+        self,
+        boardSize: int,
+        shipsAmount: int,
+        firstPlayer: PlayerType,
+        boardType: BoardType = BoardType.List,
+        fleet: list[ShipType] | None = None,
+    ):
+        self.boardSize: int = boardSize
+        self.fleet: list[ShipType] = (
+            [ShipType.Submarine] * shipsAmount
+            if fleet is None
+            else sorted(fleet, reverse=True)
+        )
+        self.shipsAmount: int = len(self.fleet)
+        self.firstPlayer: PlayerType = firstPlayer
+        self.boardType: BoardType = boardType
+
+        self.playerBoard: Board = boardType.create(boardSize)
+        self.machineBoard: Board = boardType.create(boardSize)
+
+        self.playerShips: list[Ship] = []
+        self.machineShips: list[Ship] = []
+        self.playerShipsIndex: dict[int, Ship] = {}
+        self.machineShipsIndex: dict[int, Ship] = {}
+        self.playerRemainingShips: int = 0
+        self.machineRemainingShips: int = 0
+        self.playerShotsFired: int = 0
+        self.machineShotsFired: int = 0
+
+        self.turn: PlayerType = firstPlayer
+        self.journal: "Journal | None" = None
+        self.owned: bool = True
+        self.ownedShips: set[Ship] | None = None
+
+    @staticmethod
+    def fleetRepr(fleet: list[ShipType]) -> str:
+        return "[" + ", ".join(f"ShipType.{type.name}" for type in fleet) + "]"
+
+    def __repr__(self) -> str:
+        return f"Engine({self.boardSize}, {self.shipsAmount}, PlayerType.{self.firstPlayer.name}, BoardType.{self.boardType.name}, {Engine.fleetRepr(self.fleet)})"
+
+    def fork(self) -> Self:
+        engine: Self = object.__new__(type(self))
+        engine.__dict__.update(self.__dict__)
+        engine.journal = None
+        engine.playerBoard = self.playerBoard.fork()
+        engine.machineBoard = self.machineBoard.fork()
+        engine.owned = self.owned = False
+        engine.ownedShips = set()
+        self.ownedShips = set()
+        return engine
+
+    def rollback(self, snapshot: "Engine") -> None:
+        journal: "Journal | None" = self.journal
+        self.__dict__.update(snapshot.fork().__dict__)
+        self.journal = journal
+
+    def own(self) -> None:
+        if self.owned:
+            return
+        self.owned = True
+        self.playerShips = list(self.playerShips)
+        self.machineShips = list(self.machineShips)
+        self.playerShipsIndex = dict(self.playerShipsIndex)
+        self.machineShipsIndex = dict(self.machineShipsIndex)
+
+    def ownShip(self, player: PlayerType, ship: Ship) -> Ship:
+        self.own()
+        owned: Ship = ship.copy()
+        ships: list[Ship] = self.getShips(player)
+        ships[ships.index(ship)] = owned
+        index: dict[int, Ship] = self.getShipsIndex(player)
+        for x, y in ship.coords:
+            index[x * self.boardSize + y] = owned
+        if self.ownedShips is not None:
+            self.ownedShips.add(owned)
+        return owned
+
+    @property
+    def currentBoard(self) -> Board:
+        return self.playerBoard if self.turn == PlayerType.Human else self.machineBoard
+
+    @property
+    def winner(self) -> PlayerType | None:
+        if (
+            len(self.playerShips) < self.shipsAmount
+            or len(self.machineShips) < self.shipsAmount
+        ):
+            return None
+        if not self.playerRemainingShips:
+            return PlayerType.Machine
+        if not self.machineRemainingShips:
+            return PlayerType.Human
+        return None
+
+    def getBoard(self, player: PlayerType) -> Board:
+        return self.playerBoard if player == PlayerType.Human else self.machineBoard
+
+    def getShips(self, player: PlayerType) -> list[Ship]:
+        return self.playerShips if player == PlayerType.Human else self.machineShips
+
+    def getShipsIndex(self, player: PlayerType) -> dict[int, Ship]:
+        return (
+            self.playerShipsIndex
+            if player == PlayerType.Human
+            else self.machineShipsIndex
+        )
+
+    def getShotsFired(self, player: PlayerType) -> int:
+        return (
+            self.playerShotsFired
+            if player == PlayerType.Human
+            else self.machineShotsFired
+        )
+
+    def isValidCoords(self, x: int, y: int) -> bool:
+        return x >= 0 and x < self.boardSize and y >= 0 and y < self.boardSize
+
+    def hasShip(self, x: int, y: int, player: PlayerType) -> bool:
+        return self.getBoard(player).hasShip(x, y)
+
+    def isShot(self, x: int, y: int, player: PlayerType) -> bool:
+        return self.getBoard(player).isShot(x, y)
+
+    def canPlaceShip(self, ship: Ship, player: PlayerType) -> bool:
+        return self.getBoard(player).canPlace(ship.coords)
+
+    def getShip(self, x: int, y: int, player: PlayerType) -> Ship | None:
+        return self.getShipsIndex(player).get(x * self.boardSize + y)
+
+    def place(self, player: PlayerType, ship: Ship) -> None:
+        if len(self.getShips(player)) >= self.shipsAmount:
+            raise ValueError(f"{player.name} already placed {self.shipsAmount} ships")
+        coords: list[tuple[int, int]] = ship.coords
+        if not self.getBoard(player).canPlace(coords):
+            raise ValueError(f"Can't place ship at {coords}")
+
+        if player == PlayerType.Human:
+            self.playerRemainingShips += 1
+        else:
+            self.machineRemainingShips += 1
+
+        self.own()
+        if self.ownedShips is not None:
+            self.ownedShips.add(ship)
+        self.getBoard(player).place(coords, ship.type)
+        self.getShips(player).append(ship)
+        index: dict[int, Ship] = self.getShipsIndex(player)
+        for x, y in coords:
+            index[x * self.boardSize + y] = ship
+
+        if self.journal is not None:
+            self.journal.recordPlace(player, ship)
+
+    def placeShips(self, player: PlayerType, ships: list[Ship]) -> None:
+        for ship in ships:
+            self.place(player, ship)
+
+    def placeRandomShips(self, player: PlayerType) -> None:
+        ships: list[Ship] = self.getShips(player)
+        fleet: list[ShipType] = self.fleet[len(ships) :]
+        placer = Placer(
+            self.boardSize, fleet, ships, self.boardType == BoardType.Sparse
+        )
+        for ship in placer.solve():
+            self.place(player, ship)
+        if profiler.enabled:
+            profiler.count("placementSteps", placer.steps)
+            profiler.count("placementFallbacks", placer.fallbacks)
+
+    def placeMachineShips(self) -> None:
+        self.placeRandomShips(PlayerType.Machine)
+
+    def fire(self, player: PlayerType, x: int, y: int) -> ShotResult:
+        if self.winner is not None:
+            raise ValueError("The game is already over")
+        if player != self.turn:
+            raise ValueError(f"It's not {player.name}'s turn")
+        if not self.isValidCoords(x, y):
+            raise ValueError(f"Invalid coords ({x}, {y})")
+
+        target: PlayerType = player.opponent()
+        if self.isShot(x, y, target):
+            raise ValueError(f"({x}, {y}) was already shot")
+
+        if player == PlayerType.Human:
+            self.playerShotsFired += 1
+        else:
+            self.machineShotsFired += 1
+
+        result: ShotResult = self.resolveShot(target, x, y)
+        if result == ShotResult.Miss:
+            self.turn = target
+
+        if self.journal is not None:
+            self.journal.recordShot(self, player, x, y)
+        return result
+
+    def resolveShot(self, target: PlayerType, x: int, y: int) -> ShotResult:
+        ship: Ship | None = self.getShip(x, y, target)
+        result: ShotResult = ShotResult.Miss
+        if ship is not None:
+            if self.ownedShips is not None and ship not in self.ownedShips:
+                ship = self.ownShip(target, ship)
+            ship.shootAt()
+            result = ShotResult.Sunk if ship.destroyed else ShotResult.Hit
+            if ship.destroyed:
+                if target == PlayerType.Human:
+                    self.playerRemainingShips -= 1
+                else:
+                    self.machineRemainingShips -= 1
+
+        self.getBoard(target).shoot(x, y)
+        return result
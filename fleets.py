@@ -0,0 +1,74 @@
+from board import ShipType
+from placement import Packer
+from settings import settings
+from util import toInt
+
+
+class Fleets:
+    TYPES = (
+        ShipType.Carrier,
+        ShipType.Battleship,
+        ShipType.Submarine,
+        ShipType.Cruiser,
+        ShipType.Patrol,
+    )
+    PRESETS_SEPARATOR = ";"
+    NAME_SEPARATOR = ":"
+
+    @staticmethod
+    def getType(letter: str) -> ShipType | None:
+        for type in Fleets.TYPES:
+            if str(type) == letter.upper():
+                return type
+        return None
+
+    @staticmethod
+    def getPresets() -> dict[str, str]:
+        presets: dict[str, str] = {}
+        for preset in settings.getValue("fleetPresets").split(
+            Fleets.PRESETS_SEPARATOR
+        ):
+            if Fleets.NAME_SEPARATOR not in preset:
+                continue
+            name, spec = preset.split(Fleets.NAME_SEPARATOR, 1)
+            presets[name.strip().lower()] = spec.strip()
+        return presets
+
+    @staticmethod
+    def parseSpec(spec: str) -> list[ShipType] | None:
+        raw: str = "".join(spec.split())
+        fleet: list[ShipType] = []
+        i: int = 0
+        while i < len(raw):
+            type: ShipType | None = Fleets.getType(raw[i])
+            end: int = i + 1
+            while end < len(raw) and raw[end].isdecimal():
+                end += 1
+            count: int | None = toInt(raw[i + 1 : end])
+            if type is None or count is None:
+                return None
+            fleet.extend([type] * count)
+            i = end
+        return sorted(fleet, reverse=True) if len(fleet) else None
+
+    @staticmethod
+    def parse(raw: str) -> list[ShipType] | None:
+        raw = raw.strip()
+        shipsAmount: int | None = toInt(raw)
+        if shipsAmount is not None:
+            if shipsAmount < 1:
+                return None
+            return [ShipType.Submarine] * shipsAmount
+
+        preset: str | None = Fleets.getPresets().get(raw.lower())
+        return Fleets.parseSpec(raw if preset is None else preset)
+
+    @staticmethod
+    def toSpec(fleet: list[ShipType]) -> str:
+        return " ".join(
+            f"{type}{fleet.count(type)}" for type in Fleets.TYPES if type in fleet
+        )
+
+    @staticmethod
+    def canFit(boardSize: int, fleet: list[ShipType]) -> bool:
+        return len(fleet) > 0 and Packer.canFit(boardSize, fleet)
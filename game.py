@@ -1,49 +1,35 @@
+from ai import Machine, MachineDifficulty
+from board import BoardType
+from copy import deepcopy
+from engine import (
+    Engine,
+    PegType,
+    PlayerType,
+    Ship,
+    ShipOrientation,
+    ShipType,
+    ShotResult,
+)
+from fleets import Fleets
 from lang import lang
-from random import randrange
-from util import IntEnum, StrEnum, center, clear, enumAuto, getInput, listToText, pause, toInt
+from profiler import profiler
+from stats import stats
+from time import perf_counter
+from typing import Callable, Self
+from render import renderer
+from util import center, echo, getInput, listToText, pause, toInt
 
 
-class ShipType(IntEnum):
-    Empty = enumAuto(0)
-    Patrol = enumAuto()
-    Cruiser = enumAuto()
-    Submarine = enumAuto()
-    Battleship = enumAuto()
-    Carrier = enumAuto()
-    Hit = enumAuto()
-
-    def __str__(self) -> str:
-        return (".", "P", "C", "S", "B", "A", "x")[self]
-
-
-class ShipOrientation(StrEnum):
-    Horizontal = "H"
-    Vertical = "V"
-
-    def __str__(self) -> str:
-        return self.value
-
-
-class PegType(IntEnum):
-    Empty = enumAuto(0)
-    Hit = enumAuto()
-    Miss = enumAuto()
-
-    def __str__(self) -> str:
-        return (".", "x", "o")[self]
-
-
-class PlayerType(IntEnum):
-    Human = enumAuto(0)
-    Machine = enumAuto()
-
-
-class Game:
+class Game(Engine):
     BOARD_SIZE_RANGE: range = range(10, 21)
     SHIPS_AMOUNT_MIN = 1
     TITLE_LENGTH = 100
     TITLE_FRAME = "#" * TITLE_LENGTH
     BOARDS_SEPARATION = 10
+    BOARDS_SEPARATOR = " " * BOARDS_SEPARATION
+    SAVE_COMMAND = "save"
+    VIEW_COMMAND = "view"
+    VIEWPORT_SIZE = BOARD_SIZE_RANGE.stop - 1
 
     @staticmethod
     def name() -> str:
@@ -60,6 +46,10 @@ class Game:
             + "\n"
         )
 
+    @staticmethod
+    def titleLines() -> list[str]:
+        return Game.titleText().split("\n")
+
     @staticmethod
     def shipsRemainingText() -> str:
         return (
@@ -80,76 +70,45 @@ class Game:
 
     @staticmethod
     def printTitle() -> None:
-        clear()
-        print(Game.titleText())
-
-    class Ship:
-        def __init__(
-            self, x: int, y: int, type: ShipType, orientation: ShipOrientation
-        ):
-            self.type: ShipType = type
-
-            self.length: int = int(type)
-            offset: int = int(self.length / 2)
-
-            self.coords: list[tuple[int, int]] = []
-            self.destroyed = False
-            self.hits = 0
-
-            if orientation == ShipOrientation.Horizontal:
-                start: int = x - offset
-                for i in range(self.length):
-                    self.coords.append((start + i, y))
-            else:
-                start: int = y - offset
-                for i in range(self.length):
-                    self.coords.append((x, start + i))
-
-        def shootAt(self) -> None:
-            self.hits += 1
-            if self.hits == self.length:
-                self.destroyed = True
-
-    def __init__(self, boardSize: int, shipsAmount: int, firstPlayer: PlayerType):
-        self.boardSize: int = boardSize
-        self.shipsAmount: int = shipsAmount
-        self.firstPlayer: PlayerType = firstPlayer
-
-        self.playerBoard: list[list[ShipType]] = []
-        self.trackingBoard: list[list[PegType]] = []
-        self.machineBoard: list[list[ShipType]] = []
-
-        for i in range(boardSize):
-            self.playerBoard.append([])
-            self.machineBoard.append([])
-            self.trackingBoard.append([])
-            for _ in range(boardSize):
-                self.playerBoard[i].append(ShipType.Empty)
-                self.machineBoard[i].append(ShipType.Empty)
-                self.trackingBoard[i].append(PegType.Empty)
-
-        self.playerShips: list[Game.Ship] = []
-        self.machineShips: list[Game.Ship] = []
-        self.playerRemainingShips: int = 0
-        self.machineRemainingShips: int = 0
-
-        self.turn: PlayerType = firstPlayer
-
-        boardDisplaySize: int = boardSize * 2 + 1
-        self.boardsSeparator: str = " " * Game.BOARDS_SEPARATION
-        self.boardDirectionIndicator: str = center(
-            "  "
-            + ("> " * boardSize).strip()
-            + self.boardsSeparator
-            + "  "
-            + ("> " * boardSize).strip(),
+        renderer.draw(Game.titleLines())
+
+    Ship = Ship
+
+    def __init__(
+        self,
+        boardSize: int,
+        shipsAmount: int,
+        firstPlayer: PlayerType,
+        difficulty: MachineDifficulty = MachineDifficulty.Easy,
+        boardType: BoardType = BoardType.List,
+        fleet: list[ShipType] | None = None,
+    ):
+        super().__init__(boardSize, shipsAmount, firstPlayer, boardType, fleet)
+        self.difficulty: MachineDifficulty = difficulty
+        self.machine: Machine = difficulty.create(boardSize, self.fleet)
+        self.savePath: str = ""
+        self.onSave: Callable[[Game], str] | None = None
+
+        self.viewSize: int = min(boardSize, Game.VIEWPORT_SIZE)
+        self.viewX: int = 0
+        self.viewY: int = 0
+
+    @property
+    def boardDirectionIndicator(self) -> str:
+        indicator: str = ("> " * self.viewSize).strip()
+        return center(
+            "  " + indicator + Game.BOARDS_SEPARATOR + "  " + indicator,
             Game.TITLE_LENGTH,
             includeRight=False,
         )
-        self.boardsTitles: str = (
+
+    @property
+    def boardsTitles(self) -> str:
+        boardDisplaySize: int = self.viewSize * 2 + 1
+        return (
             center(
                 center(lang.getMessage("playerBoardName"), boardDisplaySize)
-                + self.boardsSeparator
+                + Game.BOARDS_SEPARATOR
                 + center(lang.getMessage("trackingBoardName"), boardDisplaySize),
                 Game.TITLE_LENGTH,
                 includeRight=False,
@@ -157,85 +116,28 @@ class Game:
             + "\n"
         )
 
-    def __repr__(self) -> str:
-        return f"Game({self.boardSize}, {self.shipsAmount}, PlayerType.{self.firstPlayer.name})"
-
-    @property
-    def currentBoard(self) -> list[list[ShipType]]:
-        return self.playerBoard if self.turn == PlayerType.Human else self.machineBoard
-
-    def getBoard(self, player: PlayerType) -> list[list[ShipType]]:
-        return self.playerBoard if player == PlayerType.Human else self.machineBoard
-
-    def getShips(self, player: PlayerType) -> list[Ship]:
-        return self.playerShips if player == PlayerType.Human else self.machineShips
-
-    def isValidCoords(self, x: int, y: int) -> bool:
-        return x >= 0 and x < self.boardSize and y >= 0 and y < self.boardSize
-
-    def hasShip(self, x: int, y: int, player: PlayerType) -> bool:
-        return self.getBoard(player)[x][y] != ShipType.Empty
-
-    def canPlaceShip(self, ship: Ship, player: PlayerType) -> bool:
-        for x, y in ship.coords:
-            if not self.isValidCoords(x, y):
-                return False
-            for i in range(4):
-                nx: int = x + (1, -1, 0, 0)[i]
-                ny: int = y + (0, 0, -1, 1)[i]
-                if self.isValidCoords(nx, ny) and self.hasShip(nx, ny, player):
-                    return False
-        return True
-
-    def getShip(self, x: int, y: int, player: PlayerType) -> Ship | None:
-        for ship in self.getShips(player):
-            try:
-                ship.coords.index((x, y))
-                return ship
-            except ValueError:
-                continue
-        return None
+    def fork(self) -> Self:
+        game: Self = super().fork()
+        game.machine = deepcopy(self.machine)
+        return game
 
-    def placeShip(self, ship: Ship, player: PlayerType) -> None:
-        if player == PlayerType.Human:
-            self.playerRemainingShips += 1
-        else:
-            self.machineRemainingShips += 1
-
-        board: list[list[ShipType]] = self.getBoard(player)
-        for x, y in ship.coords:
-            board[x][y] = ship.type
-
-    def placeMachineShips(self) -> None:
-        placed: int = 0
-        while placed < self.shipsAmount:
-            x: int = randrange(self.boardSize)
-            if not self.isValidCoords(x, 0):
-                continue
-            y: int = randrange(self.boardSize)
-            if not self.isValidCoords(x, y):
-                continue
-
-            orientation: ShipOrientation = ShipOrientation.getRandom()
-            ship: Game.Ship = Game.Ship(x, y, ShipType.Submarine, orientation)
-            if not self.canPlaceShip(ship, PlayerType.Machine):
-                continue
-
-            self.placeShip(ship, PlayerType.Machine)
-            self.getShips(PlayerType.Machine).append(ship)
-            self.machineBoard[x][y] = ShipType.Submarine
-            placed += 1
+    def __repr__(self) -> str:
+        return f"Game({self.boardSize}, {self.shipsAmount}, PlayerType.{self.firstPlayer.name}, MachineDifficulty.{self.difficulty.name}, BoardType.{self.boardType.name}, {Engine.fleetRepr(self.fleet)})"
 
     def createShip(self, i: int) -> Ship:
-        type: ShipType = ShipType.Submarine
+        type: ShipType = self.fleet[i - 1]
         while True:
             raw = getInput(
                 lang.getMessage(
-                    "createShipInput", i, "|".join(ShipOrientation.values())
+                    "createShipInput",
+                    i,
+                    type.name,
+                    int(type),
+                    "|".join(ShipOrientation.values()),
                 )
             ).split()
             if len(raw) != 3:
-                print(lang.getMessage("invalidFormat"))
+                echo(lang.getMessage("invalidFormat"))
                 continue
 
             x: int | None = toInt(raw[0])
@@ -245,17 +147,17 @@ class Game:
             )
 
             if x is None or y is None or not self.isValidCoords(x - 1, y - 1):
-                print(lang.getMessage("invalidCoords"))
+                echo(lang.getMessage("invalidCoords"))
                 continue
             x -= 1
             y -= 1
             if orientation is None:
-                print(lang.getMessage("createShipInvalidOrientation"))
+                echo(lang.getMessage("createShipInvalidOrientation"))
                 continue
 
             ship: Game.Ship = Game.Ship(x, y, type, orientation)
             if not self.canPlaceShip(ship, PlayerType.Human):
-                print(lang.getMessage("createShipCantPlace"))
+                echo(lang.getMessage("createShipCantPlace"))
                 continue
 
             return ship
@@ -263,13 +165,15 @@ class Game:
     def getShipPlacements(self) -> None:
         Game.printTitle()
 
-        print(lang.getMessage("boardSizeFinal", self.boardSize))
-        print(lang.getMessage("shipsAmountFinal", self.shipsAmount))
-        print(lang.getMessage("firstPlayerFinal", self.firstPlayer.name))
-        print()
+        echo(lang.getMessage("boardSizeFinal", self.boardSize))
+        echo(lang.getMessage("shipsAmountFinal", self.shipsAmount))
+        echo(lang.getMessage("fleetFinal", Fleets.toSpec(self.fleet)))
+        echo(lang.getMessage("firstPlayerFinal", self.firstPlayer.name))
+        echo(lang.getMessage("difficultyFinal", self.difficulty.name))
+        echo()
 
-        print(lang.getMessage("getShipPlacementCoords", self.boardSize))
-        print(
+        echo(lang.getMessage("getShipPlacementCoords", self.boardSize))
+        echo(
             lang.getMessage(
                 "getShipPlacementOrientation", listToText(ShipOrientation.values())
             )
@@ -277,138 +181,174 @@ class Game:
 
         for i in range(self.shipsAmount):
             ship: Game.Ship = self.createShip(i + 1)
-            self.placeShip(ship, PlayerType.Human)
-            self.getShips(PlayerType.Human).append(ship)
+            self.place(PlayerType.Human, ship)
 
-    def display(self, turn: bool = True) -> None:
-        Game.printTitle()
-        print(Game.shipsRemainingText())
+    def getFrame(self, turn: bool = True) -> list[str]:
+        lines: list[str] = Game.titleLines()
+        lines.extend(Game.shipsRemainingText().split("\n"))
 
         playerRemainingShips: str = str(self.playerRemainingShips)
         machineRemainingShips: str = str(self.machineRemainingShips)
         length: int = max(len(playerRemainingShips), len(machineRemainingShips))
         playerRemainingShips = playerRemainingShips.rjust(length)
-        print(
+        lines.append(
             center(
                 playerRemainingShips + " | " + machineRemainingShips,
                 Game.TITLE_LENGTH,
                 includeRight=False,
             )
         )
-        print()
-
-        print(self.boardsTitles)
-
-        for i in reversed(range(self.boardSize)):
-            line: str = "^ "
-            for j in range(self.boardSize):
-                line += str(self.playerBoard[j][i]) + " "
-
-            line = line.rstrip() + self.boardsSeparator + "^ "
-            for j in range(self.boardSize):
-                line += str(self.trackingBoard[j][i]) + " "
-
-            print(center(line.rstrip(), Game.TITLE_LENGTH, includeRight=False))
+        lines.append("")
+
+        lines.extend(self.boardsTitles.split("\n"))
+
+        playerBoard = self.playerBoard
+        machineBoard = self.machineBoard
+        columns: range = range(self.viewX, self.viewX + self.viewSize)
+        for i in reversed(range(self.viewY, self.viewY + self.viewSize)):
+            line: str = (
+                "^ "
+                + " ".join([str(playerBoard.get(j, i)) for j in columns])
+                + Game.BOARDS_SEPARATOR
+                + "^ "
+                + " ".join([str(machineBoard.getPeg(j, i)) for j in columns])
+            )
+            lines.append(center(line, Game.TITLE_LENGTH, includeRight=False))
 
-        print(self.boardDirectionIndicator)
+        lines.append(self.boardDirectionIndicator)
+        if self.viewSize < self.boardSize:
+            lines.append(
+                center(
+                    lang.getMessage(
+                        "viewport",
+                        self.viewX + 1,
+                        self.viewX + self.viewSize,
+                        self.viewY + 1,
+                        self.viewY + self.viewSize,
+                        Game.VIEW_COMMAND,
+                    ),
+                    Game.TITLE_LENGTH,
+                    includeRight=False,
+                )
+            )
 
-        print()
+        lines.append("")
         if turn:
-            print(
+            lines.append(
                 center(
                     lang.getMessage("turn", self.turn.name),
                     Game.TITLE_LENGTH,
                     includeRight=False,
                 )
             )
-            print()
+            lines.append("")
+
+        return lines
+
+    def setView(self, x: int, y: int) -> None:
+        limit: int = self.boardSize - self.viewSize
+        self.viewX = min(max(x - self.viewSize // 2, 0), limit)
+        self.viewY = min(max(y - self.viewSize // 2, 0), limit)
+
+    def display(self, turn: bool = True) -> None:
+        start: float = perf_counter()
+        renderer.draw(self.getFrame(turn))
+        if profiler.enabled:
+            profiler.time("render", start)
+
+    @staticmethod
+    def printShotResult(result: ShotResult, shooter: str) -> None:
+        if result == ShotResult.Miss:
+            echo(lang.getMessage("miss"))
+        else:
+            echo(
+                lang.getMessage("sunk" if result == ShotResult.Sunk else "hit", shooter)
+            )
 
     def getShotTarget(self) -> bool:
         while True:
+            start: float = perf_counter()
             raw = getInput(lang.getMessage("shootInput")).split()
+            if profiler.enabled:
+                profiler.time("input", start)
+            if (
+                self.onSave is not None
+                and len(raw) == 1
+                and raw[0].lower() == Game.SAVE_COMMAND
+            ):
+                echo(lang.getMessage("gameSaved", self.onSave(self)))
+                continue
+            if len(raw) == 3 and raw[0].lower() == Game.VIEW_COMMAND:
+                viewX: int | None = toInt(raw[1])
+                viewY: int | None = toInt(raw[2])
+                if (
+                    viewX is None
+                    or viewY is None
+                    or not self.isValidCoords(viewX - 1, viewY - 1)
+                ):
+                    echo(lang.getMessage("invalidCoords"))
+                    continue
+                self.setView(viewX - 1, viewY - 1)
+                self.display()
+                continue
             if len(raw) != 2:
-                print(lang.getMessage("invalidFormat"))
+                echo(lang.getMessage("invalidFormat"))
                 continue
 
             x: int | None = toInt(raw[0])
             y: int | None = toInt(raw[1])
             if x is None or y is None or not self.isValidCoords(x - 1, y - 1):
-                print(lang.getMessage("invalidCoords"))
+                echo(lang.getMessage("invalidCoords"))
                 continue
 
             x -= 1
             y -= 1
-            if self.machineBoard[x][y] == ShipType.Hit:
-                print(lang.getMessage("shootAlreadyShot"))
+            if self.isShot(x, y, PlayerType.Machine):
+                echo(lang.getMessage("shootAlreadyShot"))
                 continue
 
-            ship: Game.Ship | None = self.getShip(x, y, PlayerType.Machine)
-            miss: bool = ship is None
-            if miss:
-                print(lang.getMessage("miss"))
-            else:
-                ship.shootAt()
-                print(lang.getMessage("sunk" if ship.destroyed else "hit", "You get"))
-                if ship.destroyed:
-                    self.machineRemainingShips -= 1
-
-            self.machineBoard[x][y] = ShipType.Hit
-            self.trackingBoard[x][y] = PegType.Miss if miss else PegType.Hit
-            return not miss
+            start = perf_counter()
+            result: ShotResult = self.fire(PlayerType.Human, x, y)
+            if profiler.enabled:
+                profiler.time("shot", start)
+            Game.printShotResult(result, "You get")
+            return result != ShotResult.Miss
 
     def shootAtHuman(self) -> bool:
-        while True:
-            x: int = randrange(self.boardSize)
-            if not self.isValidCoords(x, 0):
-                continue
-            y: int = randrange(self.boardSize)
-            if not self.isValidCoords(x, y) or self.playerBoard[x][y] == ShipType.Hit:
-                continue
-
-            print(lang.getMessage("machineShoots", x + 1, y + 1))
-            ship: Game.Ship | None = self.getShip(x, y, PlayerType.Human)
-            miss: bool = ship is None
-            if miss:
-                print(lang.getMessage("miss"))
-            else:
-                ship.shootAt()
-                print(
-                    lang.getMessage(
-                        "sunk" if ship.destroyed else "hit", "The machine gets"
-                    )
-                )
-                if ship.destroyed:
-                    self.playerRemainingShips -= 1
-
-            self.playerBoard[x][y] = ShipType.Hit
-            return not miss
+        start: float = perf_counter()
+        x, y = self.machine.getShot()
+        if profiler.enabled:
+            profiler.time("ai", start)
+        echo(lang.getMessage("machineShoots", x + 1, y + 1))
+        start = perf_counter()
+        result: ShotResult = self.fire(PlayerType.Machine, x, y)
+        if profiler.enabled:
+            profiler.time("shot", start)
+        self.machine.record(x, y, result)
+        Game.printShotResult(result, "The machine gets")
+        return result != ShotResult.Miss
 
     def play(self) -> None:
-        while self.playerRemainingShips and self.machineRemainingShips:
+        start: float = perf_counter()
+        while self.winner is None:
             self.display()
 
-            hit: bool = (
+            if self.turn == PlayerType.Human:
                 self.getShotTarget()
-                if self.turn == PlayerType.Human
-                else self.shootAtHuman()
-            )
-            if not hit:
-                self.turn = (
-                    PlayerType.Human
-                    if self.turn == PlayerType.Machine
-                    else PlayerType.Machine
-                )
+            else:
+                self.shootAtHuman()
 
             pause()
 
+        stats.record(self, perf_counter() - start)
+        if self.journal is not None:
+            self.journal.close()
         self.display(False)
-        print(
+        echo(
             center(
-                lang.getMessage(
-                    "win", "Human" if self.playerRemainingShips else "Machine"
-                ),
+                lang.getMessage("win", self.winner.name),
                 Game.TITLE_LENGTH,
                 includeRight=False,
             )
         )
-        print()
+        echo()
@@ -0,0 +1,243 @@
+from board import BoardType, Ship, ShipOrientation, ShipType
+from engine import Engine, PlayerType
+from io import BufferedWriter
+from mmap import ACCESS_READ, mmap
+from struct import Struct
+
+
+class Journal:
+    MAGIC = b"PYBJ"
+    VERSION = 1
+    EXTENSION = ".bjnl"
+    SNAPSHOT_INTERVAL = 64
+    # magic, version, board type, board size, ships amount, first player,
+    # snapshot interval
+    HEADER = Struct("<4sBBBBBH")
+    # op (kind << 1 | player), type << 1 | orientation, x, y
+    RECORD = Struct("<BBBB")
+    # turn, shots fired (human, machine)
+    SNAPSHOT = Struct("<BHH")
+    # the header and records store sizes, amounts and coords in a byte
+    MAX_VALUE = 255
+    PLACE = 0
+    SHOT = 1
+
+    @staticmethod
+    def getBitmapSize(boardSize: int) -> int:
+        return (boardSize * boardSize + 7) // 8
+
+    @staticmethod
+    def getSnapshotSize(boardSize: int) -> int:
+        return Journal.SNAPSHOT.size + 2 * Journal.getBitmapSize(boardSize)
+
+    @staticmethod
+    def canRecord(engine: Engine) -> bool:
+        return (
+            engine.boardSize <= Journal.MAX_VALUE
+            and engine.shipsAmount <= Journal.MAX_VALUE
+        )
+
+    def __init__(self, path: str, engine: Engine) -> None:
+        if not Journal.canRecord(engine):
+            raise ValueError(
+                f"Can't record {engine.shipsAmount} ships on a "
+                f"{engine.boardSize}x{engine.boardSize} board"
+            )
+        self.path: str = path
+        self.boardSize: int = engine.boardSize
+        self.interval: int = Journal.SNAPSHOT_INTERVAL
+        self.shots: int = 0
+        self.file: BufferedWriter | None = open(path, "wb")
+        self.file.write(
+            Journal.HEADER.pack(
+                Journal.MAGIC,
+                Journal.VERSION,
+                tuple(BoardType.values()).index(engine.boardType),
+                engine.boardSize,
+                engine.shipsAmount,
+                engine.firstPlayer,
+                self.interval,
+            )
+        )
+
+    def write(self, data: bytes) -> None:
+        if self.file is None:
+            raise ValueError("Journal is closed")
+        self.file.write(data)
+
+    def recordPlace(self, player: PlayerType, ship: Ship) -> None:
+        orientation: int = ShipOrientation.values().index(ship.orientation)
+        self.write(
+            Journal.RECORD.pack(
+                Journal.PLACE << 1 | player,
+                int(ship.type) << 1 | orientation,
+                ship.x,
+                ship.y,
+            )
+        )
+
+    def recordShot(self, engine: Engine, player: PlayerType, x: int, y: int) -> None:
+        self.write(Journal.RECORD.pack(Journal.SHOT << 1 | player, 0, x, y))
+        self.shots += 1
+        if not self.shots % self.interval:
+            self.write(Journal.packSnapshot(engine))
+
+    @staticmethod
+    def packSnapshot(engine: Engine) -> bytes:
+        data = bytearray(
+            Journal.SNAPSHOT.pack(
+                engine.turn, engine.playerShotsFired, engine.machineShotsFired
+            )
+        )
+        for player in PlayerType.values():
+            bitmap = bytearray(Journal.getBitmapSize(engine.boardSize))
+            for x in range(engine.boardSize):
+                for y in range(engine.boardSize):
+                    if engine.isShot(x, y, player):
+                        bit: int = x * engine.boardSize + y
+                        bitmap[bit >> 3] |= 1 << (bit & 7)
+            data += bitmap
+        return bytes(data)
+
+    def flush(self) -> None:
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class Replay:
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        journalFile = open(path, "rb")
+        self.data: mmap = mmap(journalFile.fileno(), 0, access=ACCESS_READ)
+        journalFile.close()
+
+        if len(self.data) < Journal.HEADER.size:
+            raise ValueError(f"Not a journal file: {path}")
+        fields: tuple[int, ...] = Journal.HEADER.unpack_from(self.data, 0)
+        if fields[0] != Journal.MAGIC:
+            raise ValueError(f"Not a journal file: {path}")
+        if fields[1] != Journal.VERSION:
+            raise ValueError(f"Unsupported journal version {fields[1]}: {path}")
+
+        self.boardType: BoardType = tuple(BoardType.values())[fields[2]]
+        self.boardSize: int = fields[3]
+        self.shipsAmount: int = fields[4]
+        self.firstPlayer: PlayerType = PlayerType(fields[5])
+        self.interval: int = fields[6]
+
+        self.placements: int = 2 * self.shipsAmount
+        self.shotsOffset: int = (
+            Journal.HEADER.size + self.placements * Journal.RECORD.size
+        )
+        self.blockSize: int = (
+            self.interval * Journal.RECORD.size
+            + Journal.getSnapshotSize(self.boardSize)
+        )
+        self.shots: int = self.countShots()
+        self.base: Engine | None = None
+
+    def __enter__(self) -> "Replay":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.data.close()
+
+    def countShots(self) -> int:
+        size: int = len(self.data) - self.shotsOffset
+        if size <= 0:
+            return 0
+        blocks, rest = divmod(size, self.blockSize)
+        return blocks * self.interval + min(rest // Journal.RECORD.size, self.interval)
+
+    def getShotOffset(self, shot: int) -> int:
+        blocks, index = divmod(shot, self.interval)
+        return self.shotsOffset + blocks * self.blockSize + index * Journal.RECORD.size
+
+    def getSnapshotOffset(self, snapshot: int) -> int:
+        return (
+            self.shotsOffset
+            + snapshot * self.blockSize
+            - Journal.getSnapshotSize(self.boardSize)
+        )
+
+    def getShot(self, shot: int) -> tuple[PlayerType, int, int]:
+        op, _, x, y = Journal.RECORD.unpack_from(self.data, self.getShotOffset(shot))
+        return PlayerType(op & 1), x, y
+
+    def createEngine(self) -> Engine:
+        if self.base is None:
+            self.base = self.placeShips()
+        return self.base.fork()
+
+    def placeShips(self) -> Engine:
+        records: list[tuple[int, int, int, int]] = [
+            Journal.RECORD.unpack_from(
+                self.data, Journal.HEADER.size + i * Journal.RECORD.size
+            )
+            for i in range(self.placements)
+        ]
+        engine = Engine(
+            self.boardSize,
+            self.shipsAmount,
+            self.firstPlayer,
+            self.boardType,
+            [
+                ShipType(shipInfo >> 1)
+                for op, shipInfo, _, _ in records
+                if PlayerType(op & 1) == PlayerType.Human
+            ],
+        )
+        orientations: list[ShipOrientation] = ShipOrientation.values()
+        for op, shipInfo, x, y in records:
+            ship = Ship(x, y, ShipType(shipInfo >> 1), orientations[shipInfo & 1])
+            engine.place(PlayerType(op & 1), ship)
+        return engine
+
+    def applySnapshot(self, engine: Engine, snapshot: int) -> None:
+        offset: int = self.getSnapshotOffset(snapshot)
+        turn, playerShotsFired, machineShotsFired = Journal.SNAPSHOT.unpack_from(
+            self.data, offset
+        )
+        offset += Journal.SNAPSHOT.size
+
+        bitmapSize: int = Journal.getBitmapSize(self.boardSize)
+        for player in PlayerType.values():
+            bitmap: bytes = self.data[offset : offset + bitmapSize]
+            offset += bitmapSize
+            for bit in range(self.boardSize * self.boardSize):
+                if bitmap[bit >> 3] & (1 << (bit & 7)):
+                    engine.resolveShot(player, *divmod(bit, self.boardSize))
+
+        engine.turn = PlayerType(turn)
+        engine.playerShotsFired = playerShotsFired
+        engine.machineShotsFired = machineShotsFired
+
+    def at(self, turn: int) -> Engine:
+        if turn < 0 or turn > self.shots:
+            raise IndexError(f"Turn {turn} out of range [0, {self.shots}]")
+
+        engine: Engine = self.createEngine()
+        snapshot: int = turn // self.interval
+        snapshotSize: int = Journal.getSnapshotSize(self.boardSize)
+        while snapshot and self.getSnapshotOffset(snapshot) + snapshotSize > len(
+            self.data
+        ):
+            snapshot -= 1
+        if snapshot:
+            self.applySnapshot(engine, snapshot)
+
+        for shot in range(snapshot * self.interval, turn):
+            player, x, y = self.getShot(shot)
+            engine.fire(player, x, y)
+        return engine
+
+    def final(self) -> Engine:
+        return self.at(self.shots)
@@ -1,55 +1,123 @@
 from settings import settings
-from os import listdir
+from os import listdir, stat
+from time import monotonic
 from typing import Any
 
 
+class Template:
+    PLACEHOLDER = "{}"
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        parts: list[str] = [
+            part.replace("{", "{{").replace("}", "}}")
+            for part in text.split(Template.PLACEHOLDER)
+        ]
+        self.placeholders: int = len(parts) - 1
+        self.pattern: str = parts[0]
+        for i in range(1, len(parts)):
+            self.pattern += "{" + str(i - 1) + "!s}" + parts[i]
+
+    def format(self, args: tuple[Any, ...]) -> str:
+        if len(args) < self.placeholders:
+            if not len(args):
+                return self.text
+            args += (Template.PLACEHOLDER,) * (self.placeholders - len(args))
+        return self.pattern.format(*args)
+
+
+class Catalog:
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.mtime: float = 0.0
+        self.messages: dict[str, Template] = {}
+        self.load()
+
+    def load(self) -> None:
+        self.mtime = stat(self.path).st_mtime
+        self.messages = {}
+
+        langFile = open(self.path, encoding="utf-8")
+        for line in langFile:
+            if not len(line.strip()) or line.startswith("#"):
+                continue
+            [key, value] = line.split("=", 1)
+            self.messages[key] = Template(value.replace("\n", "").replace("''", "'"))
+        langFile.close()
+
+    def isStale(self) -> bool:
+        try:
+            return stat(self.path).st_mtime != self.mtime
+        except OSError:
+            return False
+
+    def get(self, key: str) -> Template:
+        return self.messages[key]
+
+
 class Lang:
-    LANG_FOLDER = settings.getValue("langFolder")
+    LANG_EXTENSION = ".properties"
+    CHECK_INTERVAL = 1.0
 
-    def __init__(self) -> None:
-        self.lang = settings.getValue("lang")
-        self.langs: dict[str, dict[str, str]] = {}
+    @staticmethod
+    def getLangFolder() -> str:
+        return settings.getValue("langFolder")
 
-        for file in listdir(Lang.LANG_FOLDER):
-            lang: str = file.split(".")[0]
-            langMessages: dict[str, str] = {}
+    def __init__(self) -> None:
+        self.lang: str = ""
+        self.catalogs: dict[str, Catalog] = {}
+        self.catalog: Catalog | None = None
+        self.checkAt: float = 0.0
 
-            langFile = open(Lang.LANG_FOLDER + file, encoding="utf-8")
-            for line in langFile:
-                if not len(line.strip()) or line.startswith("#"):
-                    continue
-                [key, value] = line.split("=", 1)
-                langMessages[key] = value.replace("\n", "").replace("''", "'")
+    def getCatalog(self, lang: str) -> Catalog:
+        catalog: Catalog | None = self.catalogs.get(lang)
+        if catalog is None:
+            catalog = Catalog(Lang.getLangFolder() + lang + Lang.LANG_EXTENSION)
+            self.catalogs[lang] = catalog
+        elif catalog.isStale():
+            catalog.load()
+        return catalog
 
-            langFile.close()
-            self.langs[lang] = langMessages
+    def getActiveCatalog(self) -> Catalog:
+        if not self.lang:
+            self.lang = settings.getValue("lang")
+        if self.catalog is None:
+            self.catalog = self.getCatalog(self.lang)
+        elif self.catalog.isStale():
+            self.catalog.load()
+        self.checkAt = monotonic() + Lang.CHECK_INTERVAL
+        return self.catalog
 
     def setLang(self, lang: str) -> None:
         self.lang = lang
+        self.catalog = None
         settings.setValue("lang", lang)
 
     def getLangs(self) -> list[str]:
-        return [k for k in self.langs.keys()]
+        return [
+            file.split(".")[0]
+            for file in listdir(Lang.getLangFolder())
+            if file.endswith(Lang.LANG_EXTENSION)
+        ]
 
     def getLangNames(self) -> list[str]:
-        return [k["langName"] for k in self.langs.values()]
+        return [self.getLangName(k) for k in self.getLangs()]
 
     def getLangName(self, id: str) -> str:
-        return self.langs[id]["langName"]
+        return self.getCatalog(id).get("langName").text
 
     def getLangId(self, name: str) -> str:
-        for k, v in self.langs.items():
-            if v["langName"] == name:
+        for k in self.getLangs():
+            if self.getLangName(k) == name:
                 return k
         return "en"
 
     def getMessage(self, key: str, *args: Any) -> str:
-        value: str = self.langs[self.lang][key]
-        if not len(args):
-            return value
-        for i in range(len(args)):
-            value = value.replace("{}", str(args[i]), 1)
-        return value
+        catalog: Catalog | None = self.catalog
+        if catalog is None or monotonic() >= self.checkAt:
+            catalog = self.getActiveCatalog()
+        template: Template = catalog.messages[key]
+        return template.format(args) if args else template.text
 
 
 lang = Lang()
@@ -0,0 +1,159 @@
+from board import Ship, ShipType
+from collections import OrderedDict, deque
+from placement import Packer, PlacementError, Placer
+from profiler import profiler
+from random import Random
+from threading import Condition, Thread
+
+
+class LayoutPool:
+    SIZE = 8
+    MAX_KEYS = 8
+
+    @staticmethod
+    def getKey(
+        boardSize: int, fleet: list[ShipType], sparse: bool = False
+    ) -> tuple[int, bool, tuple[ShipType, ...]]:
+        return boardSize, sparse, tuple(sorted(fleet, reverse=True))
+
+    def __init__(
+        self, size: int = SIZE, maxKeys: int = MAX_KEYS, seed: int | None = None
+    ) -> None:
+        self.size: int = size
+        self.maxKeys: int = maxKeys
+        self.rng = Random(seed)
+        self.layouts: OrderedDict[
+            tuple[int, bool, tuple[ShipType, ...]],
+            deque[tuple[list[Ship], int, int]],
+        ] = OrderedDict()
+        self.errors: dict[tuple[int, bool, tuple[ShipType, ...]], Exception] = {}
+        self.condition = Condition()
+        self.thread: Thread | None = None
+        self.stopped: bool = False
+        self.generated: int = 0
+        self.misses: int = 0
+
+    def __enter__(self) -> "LayoutPool":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self.stopped = False
+        self.thread = Thread(target=self.work, name="LayoutPool", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def touch(
+        self, key: tuple[int, bool, tuple[ShipType, ...]]
+    ) -> deque[tuple[list[Ship], int, int]]:
+        layouts: deque[tuple[list[Ship], int, int]] | None = self.layouts.get(key)
+        if layouts is None:
+            layouts = deque()
+            self.layouts[key] = layouts
+            while len(self.layouts) > self.maxKeys:
+                evicted, _ = self.layouts.popitem(last=False)
+                self.errors.pop(evicted, None)
+            self.condition.notify_all()
+        else:
+            self.layouts.move_to_end(key)
+        return layouts
+
+    def request(
+        self, boardSize: int, fleet: list[ShipType], sparse: bool = False
+    ) -> tuple[int, bool, tuple[ShipType, ...]]:
+        if not Packer.canFit(boardSize, fleet):
+            raise PlacementError(
+                f"Fleet of {len(fleet)} ships can't fit on a "
+                f"{boardSize}x{boardSize} board"
+            )
+        key: tuple[int, bool, tuple[ShipType, ...]] = LayoutPool.getKey(
+            boardSize, fleet, sparse
+        )
+        self.start()
+        with self.condition:
+            self.touch(key)
+        return key
+
+    def take(
+        self, boardSize: int, fleet: list[ShipType], sparse: bool = False
+    ) -> list[Ship]:
+        key: tuple[int, bool, tuple[ShipType, ...]] = self.request(
+            boardSize, fleet, sparse
+        )
+        with self.condition:
+            if not len(self.touch(key)):
+                self.misses += 1
+            while not len(self.touch(key)):
+                self.checkError(key)
+                self.condition.wait()
+            ships, steps, fallbacks = self.layouts[key].popleft()
+            self.condition.notify_all()
+        if profiler.enabled:
+            profiler.count("placementSteps", steps)
+            profiler.count("placementFallbacks", fallbacks)
+        return ships
+
+    def wait(
+        self, boardSize: int, fleet: list[ShipType], sparse: bool = False
+    ) -> None:
+        key: tuple[int, bool, tuple[ShipType, ...]] = self.request(
+            boardSize, fleet, sparse
+        )
+        with self.condition:
+            while len(self.touch(key)) < self.size:
+                self.checkError(key)
+                self.condition.wait()
+
+    def checkError(self, key: tuple[int, bool, tuple[ShipType, ...]]) -> None:
+        error: Exception | None = self.errors.get(key)
+        if error is not None:
+            raise error
+
+    def getPending(self) -> tuple[int, bool, tuple[ShipType, ...]] | None:
+        for key in reversed(self.layouts):
+            if key not in self.errors and len(self.layouts[key]) < self.size:
+                return key
+        return None
+
+    def work(self) -> None:
+        while True:
+            with self.condition:
+                key: tuple[int, bool, tuple[ShipType, ...]] | None = self.getPending()
+                while key is None and not self.stopped:
+                    self.condition.wait()
+                    key = self.getPending()
+                if self.stopped or key is None:
+                    return
+
+            placer = Placer(key[0], list(key[2]), sparse=key[1], rng=self.rng)
+            try:
+                ships: list[Ship] = placer.solve()
+            except Exception as error:
+                with self.condition:
+                    if key in self.layouts:
+                        self.errors[key] = error
+                    self.condition.notify_all()
+                continue
+
+            with self.condition:
+                layouts: deque[tuple[list[Ship], int, int]] | None = (
+                    self.layouts.get(key)
+                )
+                if layouts is not None and len(layouts) < self.size:
+                    layouts.append((ships, placer.steps, placer.fallbacks))
+                    self.generated += 1
+                    self.condition.notify_all()
+
+
+layouts = LayoutPool()
@@ -0,0 +1,167 @@
+from argparse import ArgumentParser
+from board import ShipType
+from fleets import Fleets
+from random import shuffle
+from statistics import quantiles
+from time import perf_counter
+import asyncio
+
+
+class LoadResult:
+    def __init__(self) -> None:
+        self.games: int = 0
+        self.moves: int = 0
+        self.errors: int = 0
+        self.latencies: list[float] = []
+
+    def getPercentiles(self) -> tuple[float, float, float]:
+        if len(self.latencies) < 2:
+            latency: float = self.latencies[0] if len(self.latencies) else 0.0
+            return latency, latency, latency
+        cuts: list[float] = quantiles(self.latencies, n=100)
+        return cuts[49], cuts[94], cuts[98]
+
+
+class LoadGenerator:
+    @staticmethod
+    async def playGame(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        boardSize: int,
+        fleet: str,
+        difficulty: str,
+        result: LoadResult,
+    ) -> None:
+        cells: list[tuple[int, int]] = [
+            (x, y) for x in range(1, boardSize + 1) for y in range(1, boardSize + 1)
+        ]
+        shuffle(cells)
+        sentAt: float = 0.0
+
+        writer.write(f"PLAY MACHINE {boardSize} {fleet} {difficulty}\n".encode())
+        while True:
+            line: bytes = await reader.readline()
+            if not line:
+                raise ConnectionError("Server closed the connection")
+            parts: list[str] = line.decode().split()
+            if not len(parts):
+                continue
+
+            command: str = parts[0]
+            if command == "START":
+                writer.write(b"AUTO\n")
+            elif command == "TURN":
+                x, y = cells.pop()
+                sentAt = perf_counter()
+                writer.write(f"FIRE {x} {y}\n".encode())
+            elif command == "SHOT":
+                result.latencies.append(perf_counter() - sentAt)
+                result.moves += 1
+            elif command in ("WIN", "LOSE"):
+                result.games += 1
+                return
+            elif command in ("ERR", "END"):
+                raise ConnectionError(line.decode().strip())
+            await writer.drain()
+
+    @staticmethod
+    async def runClient(
+        host: str,
+        port: int,
+        games: int,
+        boardSize: int,
+        fleet: str,
+        difficulty: str,
+        result: LoadResult,
+    ) -> None:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            result.errors += games
+            return
+
+        try:
+            await reader.readline()
+            for _ in range(games):
+                await LoadGenerator.playGame(
+                    reader, writer, boardSize, fleet, difficulty, result
+                )
+            writer.write(b"QUIT\n")
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            result.errors += 1
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def run(
+        host: str,
+        port: int,
+        clients: int,
+        games: int,
+        boardSize: int,
+        fleet: str,
+        difficulty: str,
+    ) -> LoadResult:
+        result = LoadResult()
+        await asyncio.gather(
+            *(
+                LoadGenerator.runClient(
+                    host,
+                    port,
+                    games // clients + (i < games % clients),
+                    boardSize,
+                    fleet,
+                    difficulty,
+                    result,
+                )
+                for i in range(clients)
+            )
+        )
+        return result
+
+    @staticmethod
+    def report(result: LoadResult, elapsed: float) -> None:
+        p50, p95, p99 = result.getPercentiles()
+        print(
+            f"{result.games} games, {result.moves} moves in {elapsed:.2f}s "
+            f"({result.games / max(elapsed, 1e-9):.0f} games/s, "
+            f"{result.moves / max(elapsed, 1e-9):.0f} moves/s), {result.errors} errors"
+        )
+        print(
+            f"move latency p50 {p50 * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms, "
+            f"p99 {p99 * 1000:.2f} ms"
+        )
+
+    @staticmethod
+    def main(args: list[str]) -> None:
+        parser = ArgumentParser(prog="main.py loadtest")
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--clients", type=int, default=100)
+        parser.add_argument("--games", type=int, default=1000)
+        parser.add_argument("--size", type=int, default=10)
+        parser.add_argument("--ships", default="5")
+        parser.add_argument("--difficulty", default="easy")
+        options = parser.parse_args(args)
+        fleet: list[ShipType] | None = Fleets.parse(options.ships)
+        if fleet is None:
+            parser.error("--ships must be a ships amount, a preset or a fleet spec")
+        if not Fleets.canFit(options.size, fleet):
+            parser.error(
+                f"The fleet can't fit on a {options.size}x{options.size} board"
+            )
+
+        start: float = perf_counter()
+        result: LoadResult = asyncio.run(
+            LoadGenerator.run(
+                options.host,
+                options.port,
+                options.clients,
+                options.games,
+                options.size,
+                "".join(options.ships.split()),
+                options.difficulty,
+            )
+        )
+        LoadGenerator.report(result, perf_counter() - start)
@@ -1,9 +1,26 @@
 from settings import settings
 from menus import GreetingScreen, MainMenu
+from sys import argv
 from util import close
 
 
 def main():
+    if len(argv) > 1 and argv[1] == "tournament":
+        from tournament import Tournament
+
+        Tournament.main(argv[2:])
+        return
+    if len(argv) > 1 and argv[1] == "server":
+        from server import Server
+
+        Server.main(argv[2:])
+        return
+    if len(argv) > 1 and argv[1] == "loadtest":
+        from loadtest import LoadGenerator
+
+        LoadGenerator.main(argv[2:])
+        return
+
     if settings.getValue("firstLaunch") == str(True):
         GreetingScreen.run()
 
@@ -1,7 +1,16 @@
 from settings import settings
-from game import Game, PlayerType
+from ai import MachineDifficulty
+from fleets import Fleets
+from game import Game, PlayerType, ShipType
 from lang import lang
-from util import getInput, iterableToText, listToText, toInt
+from journal import Journal
+from layouts import layouts
+from os import makedirs, path
+from profiler import profiler
+from saves import Saves
+from time import strftime
+from stats import StatsSummary, stats
+from util import echo, getInput, iterableToText, listToText, toInt
 
 
 class GreetingScreen:
@@ -9,8 +18,9 @@ class GreetingScreen:
     def run() -> None:
         Game.printTitle()
         language = SettingsMenu.getNewLang()
-        lang.setLang(language)
-        settings.setValue("firstLaunch", False)
+        with settings.batch():
+            lang.setLang(language)
+            settings.setValue("firstLaunch", False)
         Game.printTitle()
 
 
@@ -22,20 +32,90 @@ class PlayMenu:
     @staticmethod
     def run() -> None:
         Game.printTitle()
+        profiler.start()
+        game = PlayMenu._getSavedGame()
+        if game is not None:
+            game.onSave = Saves.save
+            game.play()
+            Saves.delete(game)
+            PlayMenu._stopProfiler()
+            return
+
         boardSize = PlayMenu._getBoardSize()
-        shipsAmount = PlayMenu._getShipsAmount(boardSize)
+        fleet = PlayMenu._getFleet(boardSize)
+        layouts.request(boardSize, fleet)
         firstPlayer = PlayMenu._getFirstPlayer()
+        difficulty = PlayMenu._getDifficulty()
 
-        game = Game(boardSize, shipsAmount, firstPlayer)
+        game = Game(boardSize, len(fleet), firstPlayer, difficulty, fleet=fleet)
+        if Saves.canSave(game):
+            game.onSave = Saves.save
+        if (
+            settings.getValue("recordJournals") == str(True)
+            and Journal.canRecord(game)
+        ):
+            PlayMenu._startJournal(game)
         game.getShipPlacements()
-        game.placeMachineShips()
+        game.placeShips(PlayerType.Machine, layouts.take(boardSize, fleet))
         game.play()
+        Saves.delete(game)
+        PlayMenu._stopProfiler()
+
+    @staticmethod
+    def _stopProfiler() -> None:
+        reportPath = profiler.stop()
+        if reportPath is not None:
+            echo(lang.getMessage("profileSaved", reportPath))
+
+    @staticmethod
+    def _startJournal(game: Game) -> None:
+        folder = settings.getValue("journalsFolder")
+        makedirs(folder, exist_ok=True)
+        game.journal = Journal(
+            path.join(folder, strftime("%Y%m%d-%H%M%S") + Journal.EXTENSION), game
+        )
+
+    @staticmethod
+    def _getSavedGame() -> Game | None:
+        saves = Saves.getSaves()
+        if not len(saves):
+            return None
+
+        echo(lang.getMessage("savedGames"))
+        for i in range(len(saves)):
+            save = saves[i]
+            echo(
+                lang.getMessage(
+                    "savedGameEntry",
+                    i + 1,
+                    save.name,
+                    save.boardSize,
+                    save.boardSize,
+                    save.shipsAmount,
+                    save.playerRemainingShips,
+                    save.machineRemainingShips,
+                    save.turn.name,
+                    save.getSavedAtText(),
+                )
+            )
+        echo()
+
+        raw = getInput(lang.getMessage("loadGameInput")).strip()
+        index = toInt(raw)
+        while len(raw) and (index is None or not range(len(saves)).count(index - 1)):
+            echo(lang.getMessage("loadGameWrongInput", 1, len(saves)))
+            raw = getInput(lang.getMessage("loadGameInput")).strip()
+            index = toInt(raw)
+
+        if not len(raw):
+            return None
+        return Saves.load(saves[index - 1].path)
 
     @staticmethod
     def _getBoardSize() -> int:
         boardSize = toInt(getInput(lang.getMessage("boardSizeInput")))
         while boardSize is None or not Game.BOARD_SIZE_RANGE.count(boardSize):
-            print(
+            echo(
                 lang.getMessage(
                     "boardSizeWrongInput",
                     min(Game.BOARD_SIZE_RANGE),
@@ -47,20 +127,25 @@ class PlayMenu:
         return boardSize
 
     @staticmethod
-    def _getShipsAmount(boardSize: int) -> int:
-        shipsAmountRange = Game.shipsAmountRange(boardSize)
-        shipsAmount = toInt(getInput(lang.getMessage("shipsAmountInput")))
-        while shipsAmount is None or not shipsAmountRange.count(shipsAmount):
-            print(
+    def _getFleet(boardSize: int) -> list[ShipType]:
+        presets = Fleets.getPresets()
+        if len(presets):
+            echo(
                 lang.getMessage(
-                    "shipsAmountWrongInput",
-                    min(shipsAmountRange),
-                    max(shipsAmountRange),
+                    "fleetPresets",
+                    iterableToText(f"{k} ({v})" for k, v in presets.items()),
                 )
             )
-            shipsAmount = toInt(getInput(lang.getMessage("shipsAmountInput")))
 
-        return shipsAmount
+        fleet = Fleets.parse(getInput(lang.getMessage("fleetInput")))
+        while fleet is None or not Fleets.canFit(boardSize, fleet):
+            if fleet is None:
+                echo(lang.getMessage("fleetWrongInput"))
+            else:
+                echo(lang.getMessage("fleetCantFit", boardSize, boardSize))
+            fleet = Fleets.parse(getInput(lang.getMessage("fleetInput")))
+
+        return fleet
 
     @staticmethod
     def _getFirstPlayer() -> PlayerType:
@@ -68,7 +153,7 @@ class PlayMenu:
             getInput(lang.getMessage("firstPlayerInput")).capitalize()
         )
         while firstPlayer is None:
-            print(
+            echo(
                 lang.getMessage("firstPlayerWrongInput", listToText(PlayerType.names()))
             )
             firstPlayer = PlayerType.getByName(
@@ -77,15 +162,60 @@ class PlayMenu:
 
         return firstPlayer
 
+    @staticmethod
+    def _getDifficulty() -> MachineDifficulty:
+        difficulty = MachineDifficulty.getByName(
+            getInput(lang.getMessage("difficultyInput")).capitalize()
+        )
+        while difficulty is None:
+            echo(
+                lang.getMessage(
+                    "difficultyWrongInput", listToText(MachineDifficulty.names())
+                )
+            )
+            difficulty = MachineDifficulty.getByName(
+                getInput(lang.getMessage("difficultyInput")).capitalize()
+            )
+
+        return difficulty
+
 
 class StatsMenu:
     @staticmethod
     def getName() -> str:
         return lang.getMessage("statsMenuName")
 
+    @staticmethod
+    def printSummary(title: str, summary: StatsSummary) -> None:
+        echo(title)
+        echo(lang.getMessage("statsGames", summary.games))
+        for player in PlayerType.values():
+            echo(
+                lang.getMessage(
+                    "statsWins",
+                    player.name,
+                    f"{summary.getWinRate(player):.1%}",
+                    f"{summary.getMeanShotsToWin(player):.1f}",
+                )
+            )
+        echo(lang.getMessage("statsDuration", f"{summary.getMeanDuration():.0f}"))
+        echo()
+
     @staticmethod
     def run() -> None:
-        pass
+        Game.printTitle()
+        summary = stats.getSummary()
+        if not summary.games:
+            echo(lang.getMessage("statsEmpty"))
+            echo()
+            return
+
+        StatsMenu.printSummary(lang.getMessage("statsTotal"), summary)
+        for boardSize in stats.getBoardSizes():
+            StatsMenu.printSummary(
+                lang.getMessage("statsBoardSize", boardSize, boardSize),
+                stats.getSummary(boardSize),
+            )
 
 
 class SettingsMenu:
@@ -105,8 +235,8 @@ class SettingsMenu:
     def run() -> None:
         Game.printTitle()
         for i in SettingsMenu.getSettingsRange():
-            print(f"{i + 1}. {SettingsMenu.getSettingsNames()[i]}")
-        print()
+            echo(f"{i + 1}. {SettingsMenu.getSettingsNames()[i]}")
+        echo()
 
     @staticmethod
     def getNewLang() -> str:
@@ -115,7 +245,7 @@ class SettingsMenu:
             language not in lang.getLangs()
             and language.capitalize() not in lang.getLangNames()
         ):
-            print(
+            echo(
                 lang.getMessage(
                     "langWrongInput",
                     iterableToText(
@@ -142,15 +272,15 @@ class MainMenu:
 
         Game.printTitle()
         for i in MainMenu.MENUS_RANGE:
-            print(f"{i + 1}. {menuNames[i]}")
-        print()
+            echo(f"{i + 1}. {menuNames[i]}")
+        echo()
 
         menuName = getInput(lang.getMessage("selectMenu")).capitalize()
         menuInt = toInt(menuName)
         while (
             menuInt is None or not MainMenu.MENUS_RANGE.count(menuInt - 1)
         ) and not menuNames.count(menuName):
-            print(
+            echo(
                 lang.getMessage(
                     "invalidMenu",
                     iterableToText(
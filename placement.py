@@ -0,0 +1,510 @@
+from board import Ship, ShipOrientation, ShipType
+from collections import OrderedDict
+from random import Random
+from threading import Lock
+import random
+
+
+class PlacementError(Exception):
+    pass
+
+
+class Placer:
+    MAX_STEPS = 5000
+    MAX_SAMPLES = 1000
+    SHUFFLES = 3
+
+    def __init__(
+        self,
+        boardSize: int,
+        fleet: list[ShipType],
+        placed: list[Ship] | None = None,
+        sparse: bool = False,
+        rng: Random | None = None,
+    ) -> None:
+        self.boardSize: int = boardSize
+        self.rng: Random = random if rng is None else rng  # type: ignore
+        self.fleet: list[ShipType] = sorted(fleet, reverse=True)
+        self.sparse: bool = sparse
+        self.blocked: list[list[int]] = (
+            [] if sparse else [[0] * boardSize for _ in range(boardSize)]
+        )
+        self.blockedCells: dict[tuple[int, int], int] = {}
+        self.steps: int = 0
+        self.maxSteps: int = Placer.MAX_STEPS
+        self.fallbacks: int = 0
+        self.empty: bool = not placed
+
+        for ship in placed or []:
+            self.block(ship.coords, 1)
+
+    @staticmethod
+    def createShip(
+        x: int, y: int, type: ShipType, orientation: ShipOrientation
+    ) -> Ship:
+        offset: int = int(int(type) / 2)
+        if orientation == ShipOrientation.Horizontal:
+            return Ship(x + offset, y, type, orientation)
+        return Ship(x, y + offset, type, orientation)
+
+    def isValidCoords(self, x: int, y: int) -> bool:
+        return x >= 0 and x < self.boardSize and y >= 0 and y < self.boardSize
+
+    def block(self, coords: list[tuple[int, int]], amount: int) -> None:
+        if self.sparse:
+            self.blockCells(coords, amount)
+            return
+
+        for x, y in coords:
+            self.blocked[x][y] += amount
+            for i in range(4):
+                nx: int = x + (1, -1, 0, 0)[i]
+                ny: int = y + (0, 0, -1, 1)[i]
+                if self.isValidCoords(nx, ny):
+                    self.blocked[nx][ny] += amount
+
+    def blockCells(self, coords: list[tuple[int, int]], amount: int) -> None:
+        blocked: dict[tuple[int, int], int] = self.blockedCells
+        for x, y in coords:
+            for i in range(5):
+                cell: tuple[int, int] = (
+                    x + (0, 1, -1, 0, 0)[i],
+                    y + (0, 0, 0, -1, 1)[i],
+                )
+                count: int = blocked.get(cell, 0) + amount
+                if count:
+                    blocked[cell] = count
+                else:
+                    del blocked[cell]
+
+    def getPlacements(self, length: int) -> list[tuple[int, int, ShipOrientation]]:
+        placements: list[tuple[int, int, ShipOrientation]] = []
+        size: int = self.boardSize
+        blocked: list[list[int]] = self.blocked
+
+        for y in range(size):
+            run: int = 0
+            for x in range(size):
+                run = 0 if blocked[x][y] else run + 1
+                if run >= length:
+                    placements.append(
+                        (x - length + 1, y, ShipOrientation.Horizontal)
+                    )
+
+        if length == 1:
+            return placements
+
+        for x in range(size):
+            column: list[int] = blocked[x]
+            run: int = 0
+            for y in range(size):
+                run = 0 if column[y] else run + 1
+                if run >= length:
+                    placements.append((x, y - length + 1, ShipOrientation.Vertical))
+
+        return placements
+
+    def canFit(self) -> bool:
+        return Packer.isBounded(self.boardSize, self.fleet)
+
+    def greedy(self) -> list[Ship] | None:
+        rows: list[int] = [0] * ((self.boardSize + 1) // 2)
+        ships: list[Ship] = []
+
+        for type in self.fleet:
+            for i in range(len(rows)):
+                if rows[i] + int(type) > self.boardSize:
+                    continue
+                ship: Ship = Placer.createShip(
+                    rows[i], i * 2, type, ShipOrientation.Horizontal
+                )
+                if any(self.blocked[x][y] for x, y in ship.coords):
+                    continue
+                rows[i] += int(type) + 1
+                ships.append(ship)
+                break
+            else:
+                return None
+
+        result: list[Ship] = self.transform(ships)
+        if any(
+            self.blocked[x][y] for ship in result for x, y in ship.coords
+        ):
+            return ships
+        return result
+
+    def transform(self, ships: list[Ship]) -> list[Ship]:
+        transpose: bool = self.rng.random() < 0.5
+        flipX: bool = self.rng.random() < 0.5
+        flipY: bool = self.rng.random() < 0.5
+        last: int = self.boardSize - 1
+        result: list[Ship] = []
+        for ship in ships:
+            x, y = ship.coords[0]
+            length: int = ship.length - 1
+            orientation: ShipOrientation = ship.orientation
+            horizontal: bool = orientation == ShipOrientation.Horizontal
+            if flipX:
+                x = last - x - (length if horizontal else 0)
+            if flipY:
+                y = last - y - (0 if horizontal else length)
+            if transpose:
+                x, y = y, x
+                orientation = (
+                    ShipOrientation.Vertical
+                    if horizontal
+                    else ShipOrientation.Horizontal
+                )
+            result.append(Placer.createShip(x, y, ship.type, orientation))
+        return result
+
+    def shuffle(self, ships: list[Ship]) -> list[Ship]:
+        ships = self.transform(ships)
+        shipsCoords: list[list[tuple[int, int]]] = [ship.coords for ship in ships]
+        for coords in shipsCoords:
+            self.block(coords, 1)
+
+        order: list[int] = list(range(len(ships)))
+        for _ in range(Placer.SHUFFLES):
+            self.rng.shuffle(order)
+            for i in order:
+                self.block(shipsCoords[i], -1)
+                x, y, orientation = self.rng.choice(
+                    self.getPlacements(ships[i].length)
+                )
+                ships[i] = Placer.createShip(x, y, ships[i].type, orientation)
+                shipsCoords[i] = ships[i].coords
+                self.block(shipsCoords[i], 1)
+
+        for coords in shipsCoords:
+            self.block(coords, -1)
+        return ships
+
+    def sample(self) -> list[Ship] | None:
+        ships: list[Ship] = []
+        shipsCoords: list[list[tuple[int, int]]] = []
+        orientations: list[ShipOrientation] = ShipOrientation.values()
+
+        for type in self.fleet:
+            span: int = self.boardSize - int(type) + 1
+            for _ in range(Placer.MAX_SAMPLES):
+                self.steps += 1
+                orientation: ShipOrientation = self.rng.choice(orientations)
+                if orientation == ShipOrientation.Horizontal:
+                    x, y = self.rng.randrange(span), self.rng.randrange(self.boardSize)
+                else:
+                    x, y = self.rng.randrange(self.boardSize), self.rng.randrange(span)
+                ship: Ship = Placer.createShip(x, y, type, orientation)
+                coords: list[tuple[int, int]] = ship.coords
+                if not any(cell in self.blockedCells for cell in coords):
+                    break
+            else:
+                for coords in shipsCoords:
+                    self.block(coords, -1)
+                return None
+
+            self.block(coords, 1)
+            ships.append(ship)
+            shipsCoords.append(coords)
+
+        for coords in shipsCoords:
+            self.block(coords, -1)
+        return ships
+
+    def search(self) -> list[Ship] | None:
+        stack: list[list[tuple[int, int, ShipOrientation]]] = []
+        ships: list[Ship] = []
+        shipsCoords: list[list[tuple[int, int]]] = []
+        limit: int = self.steps + self.maxSteps
+
+        while len(ships) < len(self.fleet):
+            type: ShipType = self.fleet[len(ships)]
+            if len(stack) == len(ships):
+                placements = self.getPlacements(int(type))
+                self.rng.shuffle(placements)
+                stack.append(placements)
+
+            placements = stack[-1]
+            if not len(placements):
+                stack.pop()
+                if not len(ships):
+                    return None
+                ships.pop()
+                self.block(shipsCoords.pop(), -1)
+                continue
+
+            self.steps += 1
+            if self.steps > limit:
+                for coords in shipsCoords:
+                    self.block(coords, -1)
+                return None
+
+            x, y, orientation = placements.pop()
+            ship: Ship = Placer.createShip(x, y, type, orientation)
+            coords: list[tuple[int, int]] = ship.coords
+            self.block(coords, 1)
+            ships.append(ship)
+            shipsCoords.append(coords)
+
+        for coords in shipsCoords:
+            self.block(coords, -1)
+        return ships
+
+    def solve(self) -> list[Ship]:
+        if not self.canFit():
+            raise PlacementError(
+                f"Fleet of {len(self.fleet)} ships can't fit on a "
+                f"{self.boardSize}x{self.boardSize} board"
+            )
+
+        if self.sparse:
+            ships: list[Ship] | None = self.sample()
+        else:
+            ships = self.search()
+            if ships is None:
+                self.fallbacks += 1
+                ships = self.greedy()
+            if ships is None and self.empty:
+                ships = Packer.getLayout(self.boardSize, self.fleet, self.rng)
+                if ships is not None:
+                    ships = self.shuffle(ships)
+        if ships is None:
+            raise PlacementError(
+                f"Couldn't place {len(self.fleet)} ships on a "
+                f"{self.boardSize}x{self.boardSize} board"
+            )
+        return ships
+
+
+class Packer:
+    MAX_CELLS = 400
+    MAX_STATES = 10_000
+    SAMPLES = 5
+    SAMPLE_STEPS = 200
+    RESTARTS = 8
+    RESTART_STATES = 1000
+    MAX_LAYOUTS = 256
+    LAYOUTS: OrderedDict[tuple[int, tuple[ShipType, ...]], list[Ship] | None] = (
+        OrderedDict()
+    )
+    layoutsLock = Lock()
+
+    @staticmethod
+    def isBounded(boardSize: int, fleet: list[ShipType]) -> bool:
+        if not len(fleet):
+            return True
+        if max(fleet) > boardSize:
+            return False
+        if len(fleet) > (boardSize * boardSize + 1) // 2:
+            return False
+        return sum(3 * int(type) + 1 for type in fleet) <= 2 * boardSize * (
+            boardSize + 1
+        )
+
+    @staticmethod
+    def getLayout(
+        boardSize: int, fleet: list[ShipType], rng: Random | None = None
+    ) -> list[Ship] | None:
+        key: tuple[int, tuple[ShipType, ...]] = (
+            boardSize,
+            tuple(sorted(fleet, reverse=True)),
+        )
+        with Packer.layoutsLock:
+            cached: bool = key in Packer.LAYOUTS
+            layout: list[Ship] | None = Packer.LAYOUTS.get(key)
+            if cached:
+                Packer.LAYOUTS.move_to_end(key)
+
+        if not cached:
+            layout = Packer(boardSize, fleet, rng).solve()
+            with Packer.layoutsLock:
+                Packer.LAYOUTS[key] = layout
+                while len(Packer.LAYOUTS) > Packer.MAX_LAYOUTS:
+                    Packer.LAYOUTS.popitem(last=False)
+        return None if layout is None else [ship.copy() for ship in layout]
+
+    @staticmethod
+    def canFit(boardSize: int, fleet: list[ShipType]) -> bool:
+        return Packer.getLayout(boardSize, fleet) is not None
+
+    def __init__(
+        self, boardSize: int, fleet: list[ShipType], rng: Random | None = None
+    ) -> None:
+        self.boardSize: int = boardSize
+        self.fleet: list[ShipType] = sorted(fleet, reverse=True)
+        self.rng: Random = random if rng is None else rng  # type: ignore
+        self.types: list[ShipType] = sorted(set(fleet), reverse=True)
+        self.failed: set[tuple[int, tuple[int, ...], int, tuple[int, ...]]] = set()
+        self.ships: list[Ship] = []
+        self.states: int = 0
+        self.maxStates: int = Packer.MAX_STATES
+        self.shuffled: bool = False
+        self.exhausted: bool = False
+
+    def solve(self) -> list[Ship] | None:
+        if not Packer.isBounded(self.boardSize, self.fleet):
+            return None
+        ships: list[Ship] | None = self.stagger()
+        if ships is not None:
+            return ships
+
+        if self.boardSize * self.boardSize > Packer.MAX_CELLS:
+            self.exhausted = True
+        elif self.search(0, (0,) * self.boardSize, 0, self.getCounts()):
+            return self.ships
+        if self.exhausted:
+            return self.sample()
+        return None
+
+    def getCounts(self) -> tuple[int, ...]:
+        return tuple(self.fleet.count(type) for type in self.types)
+
+    def sample(self) -> list[Ship] | None:
+        sparse: bool = self.boardSize * self.boardSize > Packer.MAX_CELLS
+        for i in range(Packer.SAMPLES):
+            for _ in range(0 if sparse else Packer.RESTARTS):
+                packer = Packer(self.boardSize, self.fleet, self.rng)
+                packer.maxStates = Packer.RESTART_STATES
+                packer.shuffled = True
+                if packer.search(0, (0,) * self.boardSize, 0, packer.getCounts()):
+                    return packer.ships
+
+            placer = Placer(self.boardSize, self.fleet, sparse=sparse, rng=self.rng)
+            placer.maxSteps = Packer.SAMPLE_STEPS << i
+            ships: list[Ship] | None = (
+                placer.sample() if sparse else placer.search()
+            )
+            if ships is not None:
+                return ships
+        return None
+
+    def stagger(self) -> list[Ship] | None:
+        size: int = self.boardSize
+        counts: dict[ShipType, int] = {
+            type: self.fleet.count(type) for type in self.types
+        }
+        remaining: int = len(self.fleet)
+        ships: list[Ship] = []
+        above: list[bool] = [False] * size
+
+        for y in range(size):
+            if not remaining:
+                break
+            row: list[bool] = [False] * size
+            x: int = 0
+            while x < size and remaining:
+                for type in self.types:
+                    length: int = int(type)
+                    if (
+                        counts[type]
+                        and x + length <= size
+                        and not any(above[x : x + length])
+                    ):
+                        break
+                else:
+                    x += 1
+                    continue
+
+                counts[type] -= 1
+                remaining -= 1
+                ships.append(
+                    Placer.createShip(x, y, type, ShipOrientation.Horizontal)
+                )
+                row[x : x + length] = [True] * length
+                x += length + 1
+            above = row
+
+        return None if remaining else ships
+
+    def search(
+        self, cell: int, profile: tuple[int, ...], run: int, counts: tuple[int, ...]
+    ) -> bool:
+        if not any(counts) and not run and max(profile) <= 0:
+            return True
+        size: int = self.boardSize
+        area: int = sum(count * int(type) for count, type in zip(counts, self.types))
+        if cell == size * size or area > size * size - cell:
+            return False
+
+        key: tuple[int, tuple[int, ...], int, tuple[int, ...]] = (
+            cell,
+            profile,
+            run,
+            counts,
+        )
+        if key in self.failed or self.exhausted:
+            return False
+        self.states += 1
+        if self.states > self.maxStates:
+            self.exhausted = True
+            return False
+
+        y, x = divmod(cell, size)
+        above: int = profile[x]
+        left: int = profile[x - 1] if x else 0
+
+        if above > 0:
+            if run or left:
+                found: bool = False
+            else:
+                found = self.search(
+                    cell + 1, self.setProfile(profile, x, above - 1 or -1), 0, counts
+                )
+        elif run:
+            found = not above and self.search(
+                cell + 1, self.setProfile(profile, x, -1), run - 1, counts
+            )
+        else:
+            found = False
+            if not above and not left:
+                found = self.place(cell, profile, counts)
+            if not found:
+                found = self.search(
+                    cell + 1, self.setProfile(profile, x, 0), 0, counts
+                )
+
+        if not found:
+            self.failed.add(key)
+        return found
+
+    def place(
+        self,
+        cell: int,
+        profile: tuple[int, ...],
+        counts: tuple[int, ...],
+    ) -> bool:
+        size: int = self.boardSize
+        y, x = divmod(cell, size)
+        moves: list[tuple[int, ShipOrientation]] = []
+        for i, type in enumerate(self.types):
+            if not counts[i]:
+                continue
+            length: int = int(type)
+            if x + length <= size:
+                moves.append((i, ShipOrientation.Horizontal))
+            if length > 1 and y + length <= size:
+                moves.append((i, ShipOrientation.Vertical))
+        if self.shuffled:
+            self.rng.shuffle(moves)
+
+        for i, orientation in moves:
+            type: ShipType = self.types[i]
+            length = int(type)
+            remaining: tuple[int, ...] = counts[:i] + (counts[i] - 1,) + counts[i + 1 :]
+            self.ships.append(Placer.createShip(x, y, type, orientation))
+            if orientation == ShipOrientation.Horizontal:
+                found: bool = self.search(
+                    cell + 1, self.setProfile(profile, x, -1), length - 1, remaining
+                )
+            else:
+                found = self.search(
+                    cell + 1, self.setProfile(profile, x, length - 1), 0, remaining
+                )
+            if found:
+                return True
+            self.ships.pop()
+        return False
+
+    @staticmethod
+    def setProfile(profile: tuple[int, ...], x: int, value: int) -> tuple[int, ...]:
+        return profile[:x] + (value,) + profile[x + 1 :]
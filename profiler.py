@@ -0,0 +1,138 @@
+from settings import settings
+from atexit import register
+from os import environ, makedirs, path
+from render import renderer
+from time import perf_counter, strftime
+from typing import TYPE_CHECKING
+from util import StrEnum
+
+if TYPE_CHECKING:
+    from cProfile import Profile
+
+
+class ProfileMode(StrEnum):
+    Off = "off"
+    Timings = "timings"
+    CProfile = "cprofile"
+    Memory = "tracemalloc"
+
+
+class Profiler:
+    ENV_VAR = "BATTLESHIP_PROFILE"
+    MEMORY_TOP = 25
+
+    @staticmethod
+    def getMode() -> ProfileMode:
+        value: str = environ.get(Profiler.ENV_VAR) or settings.getValue("profile")
+        return ProfileMode.getByValue(value.lower()) or ProfileMode.Off
+
+    def __init__(self) -> None:
+        self.mode: ProfileMode = ProfileMode.Off
+        self.enabled: bool = False
+        self.timings: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = {}
+        self.profile: "Profile | None" = None
+        self.startedAt: float = 0.0
+        self.redraws: int = 0
+        self.fullRedraws: int = 0
+        self.bytesWritten: int = 0
+        self.registered: bool = False
+
+    def start(self) -> None:
+        self.stop()
+        self.mode = Profiler.getMode()
+        if self.mode == ProfileMode.Off:
+            return
+
+        self.enabled = True
+        self.timings = {}
+        self.counters = {}
+        self.startedAt = perf_counter()
+        self.redraws = renderer.redraws
+        self.fullRedraws = renderer.fullRedraws
+        self.bytesWritten = renderer.bytesWritten
+        if not self.registered:
+            register(self.stop)
+            self.registered = True
+
+        if self.mode == ProfileMode.CProfile:
+            from cProfile import Profile
+
+            self.profile = Profile()
+            self.profile.enable()
+        elif self.mode == ProfileMode.Memory:
+            import tracemalloc
+
+            tracemalloc.start()
+
+    def time(self, key: str, start: float) -> None:
+        elapsed: float = perf_counter() - start
+        timings: list[float] | None = self.timings.get(key)
+        if timings is None:
+            self.timings[key] = [elapsed]
+        else:
+            timings.append(elapsed)
+
+    def count(self, key: str, amount: int = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def getReport(self) -> list[str]:
+        lines: list[str] = [
+            f"mode: {self.mode.value}",
+            f"elapsed: {perf_counter() - self.startedAt:.3f}s",
+            "",
+            f"{'timing':<12} {'count':>8} {'total ms':>12} "
+            f"{'mean ms':>10} {'max ms':>10}",
+        ]
+        for key, timings in self.timings.items():
+            total: float = sum(timings)
+            lines.append(
+                f"{key:<12} {len(timings):>8} {total * 1000:>12.3f}"
+                f" {total * 1000 / len(timings):>10.3f} {max(timings) * 1000:>10.3f}"
+            )
+
+        lines.append("")
+        counters: dict[str, int] = dict(self.counters)
+        counters["redraws"] = renderer.redraws - self.redraws
+        counters["fullRedraws"] = renderer.fullRedraws - self.fullRedraws
+        counters["bytesWritten"] = renderer.bytesWritten - self.bytesWritten
+        for key, value in counters.items():
+            lines.append(f"{key:<20} {value:>10}")
+        return lines
+
+    def stop(self) -> str | None:
+        if not self.enabled:
+            return None
+        self.enabled = False
+
+        folder: str = settings.getValue("profilesFolder")
+        makedirs(folder, exist_ok=True)
+        basePath: str = path.join(
+            folder, strftime("%Y%m%d-%H%M%S-") + self.mode.value
+        )
+        lines: list[str] = self.getReport()
+
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(basePath + ".prof")
+            lines.append("")
+            lines.append(f"cProfile: {basePath}.prof")
+            self.profile = None
+        elif self.mode == ProfileMode.Memory:
+            import tracemalloc
+
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            lines.append("")
+            lines.append(f"memory: {current} bytes current, {peak} bytes peak")
+            for stat in snapshot.statistics("lineno")[: Profiler.MEMORY_TOP]:
+                lines.append(str(stat))
+
+        reportPath: str = basePath + ".txt"
+        with open(reportPath, "w", encoding="utf-8") as reportFile:
+            reportFile.write("\n".join(lines) + "\n")
+        return reportPath
+
+
+profiler = Profiler()
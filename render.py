@@ -0,0 +1,107 @@
+from shutil import get_terminal_size
+from typing import TextIO
+import sys
+
+
+class Renderer:
+    CLEAR = "\x1b[H\x1b[2J\x1b[3J"
+    CLEAR_LINE = "\x1b[K"
+    CLEAR_BELOW = "\x1b[J"
+    PROMPT_MARGIN = 6
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.output: TextIO | None = stream
+        self.frame: list[str] = []
+        # lines printed below the frame since it was drawn
+        self.printed: int = 0
+        self.redraws: int = 0
+        self.fullRedraws: int = 0
+        self.bytesWritten: int = 0
+
+    @staticmethod
+    def moveTo(row: int, column: int) -> str:
+        return f"\x1b[{row + 1};{column + 1}H"
+
+    @staticmethod
+    def diffLine(row: int, old: str, new: str) -> str:
+        start: int = 0
+        limit: int = min(len(old), len(new))
+        while start < limit and old[start] == new[start]:
+            start += 1
+
+        end: int = len(new)
+        if len(old) == len(new):
+            while end > start and old[end - 1] == new[end - 1]:
+                end -= 1
+
+        output: str = Renderer.moveTo(row, start) + new[start:end]
+        if len(new) < len(old):
+            output += Renderer.CLEAR_LINE
+        return output
+
+    @property
+    def stream(self) -> TextIO:
+        return self.output or sys.stdout
+
+    def isTerminal(self) -> bool:
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def fits(self, lines: list[str]) -> bool:
+        return len(lines) + Renderer.PROMPT_MARGIN <= get_terminal_size().lines
+
+    def hasScrolled(self) -> bool:
+        return len(self.frame) + self.printed >= get_terminal_size().lines
+
+    def invalidate(self) -> None:
+        self.frame = []
+        self.printed = 0
+
+    def track(self, text: str) -> None:
+        columns: int = get_terminal_size().columns
+        for line in text.split("\n"):
+            self.printed += max((len(line) - 1) // columns + 1, 1)
+
+    def echo(self, text: str = "") -> None:
+        print(text, file=self.stream)
+        self.track(text)
+
+    def write(self, output: str) -> None:
+        self.stream.flush()
+        self.stream.write(output)
+        self.stream.flush()
+        self.bytesWritten += len(output)
+
+    def clear(self) -> None:
+        self.invalidate()
+        if self.isTerminal():
+            self.write(Renderer.CLEAR)
+
+    def draw(self, lines: list[str]) -> None:
+        self.redraws += 1
+        if not self.isTerminal():
+            self.write("\n".join(lines) + "\n")
+            return
+
+        if not len(self.frame) or not self.fits(lines) or self.hasScrolled():
+            self.fullRedraws += 1
+            self.frame = lines
+            self.printed = 0
+            self.write(Renderer.CLEAR + "\n".join(lines) + "\n")
+            return
+
+        buffer: list[str] = []
+        for row, line in enumerate(lines):
+            old: str = self.frame[row] if row < len(self.frame) else ""
+            if line != old:
+                buffer.append(Renderer.diffLine(row, old, line))
+
+        buffer.append(Renderer.moveTo(len(lines), 0) + Renderer.CLEAR_BELOW)
+        self.frame = lines
+        self.printed = 0
+        self.write("".join(buffer))
+
+
+renderer = Renderer()
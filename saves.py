@@ -0,0 +1,238 @@
+from settings import settings
+from ai import MachineDifficulty
+from board import BoardType, Ship, ShipOrientation, ShipType
+from engine import PlayerType, ShotResult
+from game import Game
+from mmap import ACCESS_READ, mmap
+from os import listdir, makedirs, path, remove
+from struct import Struct
+from time import localtime, strftime, time
+
+
+class SaveInfo:
+    def __init__(self, path: str, fields: tuple[int, ...]) -> None:
+        self.path: str = path
+        self.version: int = fields[1]
+        self.boardType: BoardType = tuple(BoardType.values())[fields[2]]
+        self.boardSize: int = fields[3]
+        self.shipsAmount: int = fields[4]
+        self.firstPlayer: PlayerType = PlayerType(fields[5])
+        self.turn: PlayerType = PlayerType(fields[6])
+        self.difficulty: MachineDifficulty = MachineDifficulty(fields[7])
+        self.playerRemainingShips: int = fields[8]
+        self.machineRemainingShips: int = fields[9]
+        self.playerShotsFired: int = fields[10]
+        self.machineShotsFired: int = fields[11]
+        self.savedAt: int = fields[12]
+
+    @property
+    def name(self) -> str:
+        return path.splitext(path.basename(self.path))[0]
+
+    def getSavedAtText(self) -> str:
+        return strftime("%Y-%m-%d %H:%M", localtime(self.savedAt))
+
+
+class Saves:
+    MAGIC = b"PYBS"
+    VERSION = 1
+    EXTENSION = ".bsav"
+    # magic, version, board type, board size, ships amount, first player, turn,
+    # difficulty, remaining ships (human, machine), shots fired (human, machine),
+    # saved at
+    HEADER = Struct("<4sBBBBBBBBBHHI")
+    SHIP = Struct("<BBBB")
+    # the header and ship records store sizes, amounts and coords in a byte
+    MAX_VALUE = 255
+
+    @staticmethod
+    def getFolder() -> str:
+        return settings.getValue("savesFolder")
+
+    @staticmethod
+    def getBitmapSize(boardSize: int) -> int:
+        return (boardSize * boardSize + 7) // 8
+
+    @staticmethod
+    def getSize(boardSize: int, shipsAmount: int) -> int:
+        return Saves.HEADER.size + 2 * (
+            shipsAmount * Saves.SHIP.size + Saves.getBitmapSize(boardSize)
+        )
+
+    @staticmethod
+    def canSave(game: Game) -> bool:
+        return (
+            game.boardSize <= Saves.MAX_VALUE and game.shipsAmount <= Saves.MAX_VALUE
+        )
+
+    @staticmethod
+    def pack(game: Game) -> bytes:
+        if not Saves.canSave(game):
+            raise ValueError(
+                f"Can't save {game.shipsAmount} ships on a "
+                f"{game.boardSize}x{game.boardSize} board"
+            )
+        data = bytearray(
+            Saves.HEADER.pack(
+                Saves.MAGIC,
+                Saves.VERSION,
+                tuple(BoardType.values()).index(game.boardType),
+                game.boardSize,
+                game.shipsAmount,
+                game.firstPlayer,
+                game.turn,
+                game.difficulty,
+                game.playerRemainingShips,
+                game.machineRemainingShips,
+                game.playerShotsFired,
+                game.machineShotsFired,
+                int(time()),
+            )
+        )
+
+        orientations: list[ShipOrientation] = ShipOrientation.values()
+        for player in PlayerType.values():
+            for ship in game.getShips(player):
+                data += Saves.SHIP.pack(
+                    ship.type, ship.x, ship.y, orientations.index(ship.orientation)
+                )
+
+            bitmap = bytearray(Saves.getBitmapSize(game.boardSize))
+            for x in range(game.boardSize):
+                for y in range(game.boardSize):
+                    if game.isShot(x, y, player):
+                        bit: int = x * game.boardSize + y
+                        bitmap[bit >> 3] |= 1 << (bit & 7)
+            data += bitmap
+
+        return bytes(data)
+
+    @staticmethod
+    def unpack(data: bytes | mmap, savePath: str = "") -> Game:
+        info: SaveInfo = Saves.readInfo(data, savePath)
+        if len(data) < Saves.getSize(info.boardSize, info.shipsAmount):
+            raise ValueError(f"Truncated save file {savePath}")
+
+        fleet: list[ShipType] = [
+            ShipType(Saves.SHIP.unpack_from(data, offset)[0])
+            for offset in range(
+                Saves.HEADER.size,
+                Saves.HEADER.size + info.shipsAmount * Saves.SHIP.size,
+                Saves.SHIP.size,
+            )
+        ]
+        game = Game(
+            info.boardSize,
+            info.shipsAmount,
+            info.firstPlayer,
+            info.difficulty,
+            info.boardType,
+            fleet,
+        )
+        game.savePath = savePath
+
+        offset: int = Saves.HEADER.size
+        orientations: list[ShipOrientation] = ShipOrientation.values()
+        shots: dict[PlayerType, list[tuple[int, int]]] = {}
+        for player in PlayerType.values():
+            for _ in range(info.shipsAmount):
+                type, x, y, orientation = Saves.SHIP.unpack_from(data, offset)
+                offset += Saves.SHIP.size
+                game.place(
+                    player, Ship(x, y, ShipType(type), orientations[orientation])
+                )
+
+            bitmapSize: int = Saves.getBitmapSize(info.boardSize)
+            bitmap: bytes = data[offset : offset + bitmapSize]
+            offset += bitmapSize
+            shots[player] = [
+                divmod(bit, info.boardSize)
+                for bit in range(info.boardSize * info.boardSize)
+                if bitmap[bit >> 3] & (1 << (bit & 7))
+            ]
+
+        for player, cells in shots.items():
+            for x, y in cells:
+                game.resolveShot(player, x, y)
+
+        game.turn = info.turn
+        game.playerShotsFired = info.playerShotsFired
+        game.machineShotsFired = info.machineShotsFired
+
+        board = game.getBoard(PlayerType.Human)
+        for x, y in shots[PlayerType.Human]:
+            if not board.hasShip(x, y):
+                game.machine.record(x, y, ShotResult.Miss)
+        for ship in game.playerShips:
+            shotCoords: list[tuple[int, int]] = [
+                coords for coords in ship.coords if board.isShot(*coords)
+            ]
+            for i, (x, y) in enumerate(shotCoords):
+                sunk: bool = ship.destroyed and i == len(shotCoords) - 1
+                game.machine.record(x, y, ShotResult.Sunk if sunk else ShotResult.Hit)
+
+        return game
+
+    @staticmethod
+    def readInfo(data: bytes | mmap, savePath: str = "") -> SaveInfo:
+        if len(data) < Saves.HEADER.size:
+            raise ValueError(f"Not a save file: {savePath}")
+        fields: tuple[int, ...] = Saves.HEADER.unpack_from(data, 0)
+        if fields[0] != Saves.MAGIC:
+            raise ValueError(f"Not a save file: {savePath}")
+        if fields[1] != Saves.VERSION:
+            raise ValueError(f"Unsupported save version {fields[1]}: {savePath}")
+        return SaveInfo(savePath, fields)
+
+    @staticmethod
+    def save(game: Game) -> str:
+        folder: str = Saves.getFolder()
+        makedirs(folder, exist_ok=True)
+        savePath: str = game.savePath or path.join(
+            folder, strftime("%Y%m%d-%H%M%S") + Saves.EXTENSION
+        )
+
+        saveFile = open(savePath, "wb")
+        saveFile.write(Saves.pack(game))
+        saveFile.close()
+
+        game.savePath = savePath
+        return savePath
+
+    @staticmethod
+    def delete(game: Game) -> None:
+        if game.savePath and path.isfile(game.savePath):
+            remove(game.savePath)
+        game.savePath = ""
+
+    @staticmethod
+    def load(savePath: str) -> Game:
+        saveFile = open(savePath, "rb")
+        with mmap(saveFile.fileno(), 0, access=ACCESS_READ) as data:
+            game: Game = Saves.unpack(data, savePath)
+        saveFile.close()
+        return game
+
+    @staticmethod
+    def peek(savePath: str) -> SaveInfo:
+        saveFile = open(savePath, "rb")
+        with mmap(saveFile.fileno(), Saves.HEADER.size, access=ACCESS_READ) as data:
+            info: SaveInfo = Saves.readInfo(data, savePath)
+        saveFile.close()
+        return info
+
+    @staticmethod
+    def getSaves() -> list[SaveInfo]:
+        folder: str = Saves.getFolder()
+        if not path.isdir(folder):
+            return []
+
+        saves: list[SaveInfo] = []
+        for file in sorted(listdir(folder), reverse=True):
+            if not file.endswith(Saves.EXTENSION):
+                continue
+            try:
+                saves.append(Saves.peek(path.join(folder, file)))
+            except (OSError, ValueError):
+                continue
+        return saves
@@ -0,0 +1,296 @@
+from ai import MachineDifficulty, MonteCarloMachine
+from argparse import ArgumentParser
+from engine import Engine, PlayerType, ShipOrientation, ShipType
+from fleets import Fleets
+from game import Game
+from placement import PlacementError
+from session import Action, ActionType, Event, EventType, Session, StepResult
+import asyncio
+
+
+class Connection:
+    def __init__(
+        self,
+        server: "Server",
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.server: Server = server
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.match: Match | None = None
+        self.player: PlayerType = PlayerType.Human
+        self.closed: bool = False
+
+    async def send(self, *parts: object) -> None:
+        if self.closed:
+            return
+        self.writer.write((" ".join(str(part) for part in parts) + "\n").encode())
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.server.writeTimeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            self.close()
+
+    async def readLine(self) -> str | None:
+        try:
+            line: bytes = await asyncio.wait_for(
+                self.reader.readline(), self.server.idleTimeout
+            )
+        except asyncio.TimeoutError:
+            await self.send("ERR", "idle timeout")
+            return None
+        except (ValueError, ConnectionError):
+            return None
+        if not line:
+            return None
+        return line.decode(errors="replace").strip()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.writer.close()
+
+
+class Match:
+    def __init__(
+        self,
+        boardSize: int,
+        fleet: list[ShipType],
+        difficulty: MachineDifficulty | None = None,
+        expertSlots: asyncio.Semaphore | None = None,
+    ) -> None:
+        self.session = Session(
+            boardSize, len(fleet), PlayerType.getRandom(), difficulty, fleet=fleet
+        )
+        # sample in the process pool so Expert moves don't hold the GIL
+        if isinstance(self.session.machine, MonteCarloMachine):
+            self.session.machine.local = False
+        self.expertSlots: asyncio.Semaphore = expertSlots or asyncio.Semaphore()
+        self.connections: dict[PlayerType, Connection] = {}
+
+    def join(self, connection: Connection, player: PlayerType) -> None:
+        connection.match = self
+        connection.player = player
+        self.connections[player] = connection
+
+    async def send(self, player: PlayerType, *parts: object) -> None:
+        connection: Connection | None = self.connections.get(player)
+        if connection is not None:
+            await connection.send(*parts)
+
+    async def start(self) -> None:
+        engine: Engine = self.session.engine
+        for player, connection in self.connections.items():
+            await connection.send(
+                "START",
+                engine.boardSize,
+                engine.shipsAmount,
+                "FIRST" if player == engine.firstPlayer else "SECOND",
+                "".join(Fleets.toSpec(engine.fleet).split()),
+            )
+
+    async def step(self, player: PlayerType, action: Action) -> None:
+        if self.session.difficulty == MachineDifficulty.Expert:
+            async with self.expertSlots:
+                result: StepResult = await asyncio.to_thread(
+                    self.session.step, player, action
+                )
+        else:
+            result = self.session.step(player, action)
+        for event in result.events:
+            await self.publish(event)
+
+    async def publish(self, event: Event) -> None:
+        x: int = event.x + 1
+        y: int = event.y + 1
+        if event.type == EventType.Placed:
+            await self.send(event.player, "PLACED", x, y, event.orientation)
+        elif event.type == EventType.Ready:
+            await self.send(event.player, "READY")
+        elif event.type == EventType.Turn:
+            await self.send(event.player, "TURN")
+        elif event.type == EventType.Shot:
+            result: str = event.result.name.upper()
+            await self.send(event.player, "SHOT", x, y, result)
+            await self.send(event.player.opponent(), "INCOMING", x, y, result)
+        else:
+            await self.send(event.player, "WIN")
+            await self.send(event.player.opponent(), "LOSE")
+            self.end()
+
+    def end(self) -> None:
+        for connection in self.connections.values():
+            connection.match = None
+        self.connections = {}
+
+    async def leave(self, connection: Connection) -> None:
+        self.connections.pop(connection.player, None)
+        connection.match = None
+        await self.send(connection.player.opponent(), "END", "opponent left")
+        self.end()
+
+
+class Server:
+    MAX_LINE = 1024
+    BACKLOG = 1024
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        idleTimeout: float = 300,
+        writeTimeout: float = 10,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.idleTimeout: float = idleTimeout
+        self.writeTimeout: float = writeTimeout
+        self.waiting: dict[tuple[int, tuple[ShipType, ...]], Connection] = {}
+        self.expertSlots = asyncio.Semaphore(
+            max(MonteCarloMachine.getDefaultWorkers(), 1)
+        )
+        self.connections: int = 0
+        self.matches: int = 0
+
+    @staticmethod
+    def parseCoords(args: list[str]) -> tuple[int, int]:
+        try:
+            return int(args[0]) - 1, int(args[1]) - 1
+        except (IndexError, ValueError):
+            raise ValueError("Expected coordinates x y")
+
+    async def play(self, connection: Connection, args: list[str]) -> None:
+        if connection.match is not None or connection in self.waiting.values():
+            raise ValueError("Already playing")
+        if len(args) < 3:
+            raise ValueError("Expected PLAY MACHINE|HUMAN size fleet [difficulty]")
+
+        try:
+            boardSize: int = int(args[1])
+        except ValueError:
+            raise ValueError("Board size must be a number")
+        if boardSize not in Game.BOARD_SIZE_RANGE:
+            raise ValueError(f"Board size must be in {Game.BOARD_SIZE_RANGE}")
+        fleet: list[ShipType] | None = Fleets.parse(args[2])
+        if fleet is None:
+            raise ValueError("Fleet must be a ships amount, a preset or a spec")
+        if not await asyncio.to_thread(Fleets.canFit, boardSize, fleet):
+            raise ValueError(f"Fleet can't fit on a {boardSize}x{boardSize} board")
+
+        opponent: str = args[0].upper()
+        if opponent == "MACHINE":
+            difficulty: MachineDifficulty | None = MachineDifficulty.getByName(
+                args[3].capitalize() if len(args) > 3 else MachineDifficulty.Easy.name
+            )
+            if difficulty is None:
+                raise ValueError("Unknown difficulty")
+            match = await asyncio.to_thread(
+                Match, boardSize, fleet, difficulty, self.expertSlots
+            )
+            match.join(connection, PlayerType.Human)
+            self.matches += 1
+            await match.start()
+            return
+        if opponent != "HUMAN":
+            raise ValueError("Opponent must be MACHINE or HUMAN")
+
+        key: tuple[int, tuple[ShipType, ...]] = (boardSize, tuple(fleet))
+        waiting: Connection | None = self.waiting.pop(key, None)
+        if waiting is None or waiting.closed:
+            self.waiting[key] = connection
+            await connection.send("WAIT")
+            return
+
+        match = Match(boardSize, fleet)
+        match.join(waiting, PlayerType.Human)
+        match.join(connection, PlayerType.Machine)
+        self.matches += 1
+        await match.start()
+
+    async def dispatch(self, connection: Connection, line: str) -> bool:
+        parts: list[str] = line.split()
+        if not len(parts):
+            return True
+        command: str = parts[0].upper()
+        args: list[str] = parts[1:]
+
+        if command == "QUIT":
+            await connection.send("BYE")
+            return False
+        if command == "PING":
+            await connection.send("PONG")
+            return True
+        if command == "PLAY":
+            await self.play(connection, args)
+            return True
+
+        if command not in ("PLACE", "AUTO", "FIRE"):
+            raise ValueError(f"Unknown command {command}")
+        match: Match | None = connection.match
+        if match is None:
+            raise ValueError("Not in a game")
+        if command == "PLACE":
+            x, y = Server.parseCoords(args)
+            orientation: ShipOrientation | None = ShipOrientation.getByValue(
+                args[2].upper() if len(args) > 2 else ""
+            )
+            if orientation is None:
+                raise ValueError("Orientation must be H or V")
+            action = Action(ActionType.Place, x, y, orientation)
+        elif command == "AUTO":
+            action = Action(ActionType.AutoPlace)
+        else:
+            action = Action(ActionType.Fire, *Server.parseCoords(args))
+        await match.step(connection.player, action)
+        return True
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection = Connection(self, reader, writer)
+        self.connections += 1
+        try:
+            await connection.send("HELLO", "battleship", 1)
+            while not connection.closed:
+                line: str | None = await connection.readLine()
+                if line is None:
+                    break
+                try:
+                    if not await self.dispatch(connection, line):
+                        break
+                except (ValueError, PlacementError) as error:
+                    await connection.send("ERR", error)
+        finally:
+            self.connections -= 1
+            for key, waiting in list(self.waiting.items()):
+                if waiting is connection:
+                    del self.waiting[key]
+            if connection.match is not None:
+                await connection.match.leave(connection)
+            connection.close()
+
+    async def serve(self) -> None:
+        server = await asyncio.start_server(
+            self.handle,
+            self.host,
+            self.port,
+            limit=Server.MAX_LINE,
+            backlog=Server.BACKLOG,
+        )
+        print(f"Listening on {self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+    @staticmethod
+    def main(args: list[str]) -> None:
+        parser = ArgumentParser(prog="main.py server")
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--idle", type=float, default=300)
+        options = parser.parse_args(args)
+
+        try:
+            asyncio.run(Server(options.host, options.port, options.idle).serve())
+        except KeyboardInterrupt:
+            pass
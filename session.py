@@ -0,0 +1,288 @@
+from ai import Machine, MachineDifficulty
+from board import BoardType
+from engine import Engine, PlayerType, Ship, ShipOrientation, ShipType, ShotResult
+from struct import Struct
+from util import IntEnum, enumAuto
+
+
+class InputType(IntEnum):
+    Nothing = enumAuto(0)
+    Place = enumAuto()
+    Fire = enumAuto()
+
+
+class ActionType(IntEnum):
+    Place = enumAuto(0)
+    AutoPlace = enumAuto()
+    Fire = enumAuto()
+
+
+class EventType(IntEnum):
+    Placed = enumAuto(0)
+    Ready = enumAuto()
+    Turn = enumAuto()
+    Shot = enumAuto()
+    Won = enumAuto()
+
+
+class Action:
+    def __init__(
+        self,
+        type: ActionType,
+        x: int = 0,
+        y: int = 0,
+        orientation: ShipOrientation = ShipOrientation.Horizontal,
+    ) -> None:
+        self.type: ActionType = type
+        self.x: int = x
+        self.y: int = y
+        self.orientation: ShipOrientation = orientation
+
+    def __repr__(self) -> str:
+        return f"Action(ActionType.{self.type.name}, {self.x}, {self.y}, ShipOrientation.{self.orientation.name})"
+
+
+class Event:
+    def __init__(
+        self,
+        type: EventType,
+        player: PlayerType,
+        x: int = 0,
+        y: int = 0,
+        result: ShotResult = ShotResult.Miss,
+        orientation: ShipOrientation = ShipOrientation.Horizontal,
+    ) -> None:
+        self.type: EventType = type
+        self.player: PlayerType = player
+        self.x: int = x
+        self.y: int = y
+        self.result: ShotResult = result
+        self.orientation: ShipOrientation = orientation
+
+    def __repr__(self) -> str:
+        return f"Event(EventType.{self.type.name}, PlayerType.{self.player.name}, {self.x}, {self.y}, ShotResult.{self.result.name}, ShipOrientation.{self.orientation.name})"
+
+
+class StepResult:
+    def __init__(self, events: list[Event], expected: dict[PlayerType, InputType]):
+        self.events: list[Event] = events
+        self.expected: dict[PlayerType, InputType] = expected
+
+
+class Session:
+    MAGIC = b"PYBG"
+    VERSION = 2
+    NO_MACHINE = 0xFF
+    # magic, version, board type, board size, ships amount, first player,
+    # difficulty, ships placed (human, machine), shots fired, followed by the
+    # fleet as one ship type byte per ship
+    HEADER = Struct("<4sBBHHBBHHI")
+    # type, x, y, orientation
+    SHIP = Struct("<BHHB")
+    # x, y
+    SHOT = Struct("<HH")
+
+    def __init__(
+        self,
+        boardSize: int,
+        shipsAmount: int,
+        firstPlayer: PlayerType,
+        difficulty: MachineDifficulty | None = None,
+        boardType: BoardType = BoardType.Bit,
+        fleet: list[ShipType] | None = None,
+    ) -> None:
+        self.engine = Engine(boardSize, shipsAmount, firstPlayer, boardType, fleet)
+        self.difficulty: MachineDifficulty | None = difficulty
+        self.machine: Machine | None = None
+        self.shots: list[tuple[int, int]] = []
+        if difficulty is not None:
+            self.machine = difficulty.create(boardSize, self.engine.fleet)
+            self.engine.placeMachineShips()
+
+    def __repr__(self) -> str:
+        difficulty: str = (
+            "None"
+            if self.difficulty is None
+            else f"MachineDifficulty.{self.difficulty.name}"
+        )
+        return f"Session({self.engine.boardSize}, {self.engine.shipsAmount}, PlayerType.{self.engine.firstPlayer.name}, {difficulty}, BoardType.{self.engine.boardType.name}, {Engine.fleetRepr(self.engine.fleet)})"
+
+    @property
+    def winner(self) -> PlayerType | None:
+        return self.engine.winner
+
+    def isReady(self, player: PlayerType) -> bool:
+        return len(self.engine.getShips(player)) == self.engine.shipsAmount
+
+    def getExpected(self, player: PlayerType) -> InputType:
+        if self.machine is not None and player == PlayerType.Machine:
+            return InputType.Nothing
+        if not self.isReady(player):
+            return InputType.Place
+        if (
+            self.engine.winner is None
+            and self.isReady(player.opponent())
+            and self.engine.turn == player
+        ):
+            return InputType.Fire
+        return InputType.Nothing
+
+    def getExpectedInputs(self) -> dict[PlayerType, InputType]:
+        return {player: self.getExpected(player) for player in PlayerType.values()}
+
+    def step(self, player: PlayerType, action: Action) -> StepResult:
+        expected: InputType = self.getExpected(player)
+        events: list[Event] = []
+
+        if action.type == ActionType.Fire:
+            if expected != InputType.Fire:
+                raise ValueError(f"{player.name} can't fire now")
+            self.fire(player, action.x, action.y, events)
+        else:
+            if expected != InputType.Place:
+                raise ValueError(f"{player.name} can't place ships now")
+            if action.type == ActionType.Place:
+                self.place(player, action.x, action.y, action.orientation, events)
+            else:
+                self.placeRandom(player, events)
+
+        return StepResult(events, self.getExpectedInputs())
+
+    def place(
+        self,
+        player: PlayerType,
+        x: int,
+        y: int,
+        orientation: ShipOrientation,
+        events: list[Event],
+    ) -> None:
+        type: ShipType = self.engine.fleet[len(self.engine.getShips(player))]
+        self.engine.place(player, Ship(x, y, type, orientation))
+        events.append(Event(EventType.Placed, player, x, y, orientation=orientation))
+        self.placed(player, events)
+
+    def placeRandom(self, player: PlayerType, events: list[Event]) -> None:
+        placedShips: int = len(self.engine.getShips(player))
+        self.engine.placeRandomShips(player)
+        for ship in self.engine.getShips(player)[placedShips:]:
+            events.append(
+                Event(
+                    EventType.Placed,
+                    player,
+                    ship.x,
+                    ship.y,
+                    orientation=ship.orientation,
+                )
+            )
+        self.placed(player, events)
+
+    def placed(self, player: PlayerType, events: list[Event]) -> None:
+        if not self.isReady(player):
+            return
+        events.append(Event(EventType.Ready, player))
+        if self.isReady(player.opponent()):
+            self.advance(events)
+
+    def record(self, player: PlayerType, x: int, y: int) -> ShotResult:
+        result: ShotResult = self.engine.fire(player, x, y)
+        self.shots.append((x, y))
+        if self.machine is not None and player == PlayerType.Machine:
+            self.machine.record(x, y, result)
+        return result
+
+    def fire(self, player: PlayerType, x: int, y: int, events: list[Event]) -> None:
+        result: ShotResult = self.record(player, x, y)
+        events.append(Event(EventType.Shot, player, x, y, result))
+        self.advance(events)
+
+    def advance(self, events: list[Event]) -> None:
+        engine: Engine = self.engine
+        while (
+            self.machine is not None
+            and engine.winner is None
+            and engine.turn == PlayerType.Machine
+        ):
+            x, y = self.machine.getShot()
+            result: ShotResult = self.record(PlayerType.Machine, x, y)
+            events.append(Event(EventType.Shot, PlayerType.Machine, x, y, result))
+
+        if engine.winner is None:
+            events.append(Event(EventType.Turn, engine.turn))
+        else:
+            events.append(Event(EventType.Won, engine.winner))
+
+    def pack(self) -> bytes:
+        engine: Engine = self.engine
+        data = bytearray(
+            Session.HEADER.pack(
+                Session.MAGIC,
+                Session.VERSION,
+                tuple(BoardType.values()).index(engine.boardType),
+                engine.boardSize,
+                engine.shipsAmount,
+                engine.firstPlayer,
+                Session.NO_MACHINE if self.difficulty is None else self.difficulty,
+                len(engine.playerShips),
+                len(engine.machineShips),
+                len(self.shots),
+            )
+        )
+        data += bytes(engine.fleet)
+        orientations: list[ShipOrientation] = ShipOrientation.values()
+        for player in PlayerType.values():
+            for ship in engine.getShips(player):
+                data += Session.SHIP.pack(
+                    ship.type, ship.x, ship.y, orientations.index(ship.orientation)
+                )
+        for x, y in self.shots:
+            data += Session.SHOT.pack(x, y)
+        return bytes(data)
+
+    @staticmethod
+    def unpack(data: bytes) -> "Session":
+        if len(data) < Session.HEADER.size:
+            raise ValueError("Not a session")
+        fields: tuple[int, ...] = Session.HEADER.unpack_from(data, 0)
+        if fields[0] != Session.MAGIC:
+            raise ValueError("Not a session")
+        if fields[1] != Session.VERSION:
+            raise ValueError(f"Unsupported session version {fields[1]}")
+        size: int = (
+            Session.HEADER.size
+            + fields[4]
+            + (fields[7] + fields[8]) * Session.SHIP.size
+            + fields[9] * Session.SHOT.size
+        )
+        if len(data) < size:
+            raise ValueError("Truncated session")
+
+        session = Session(
+            fields[3],
+            fields[4],
+            PlayerType(fields[5]),
+            boardType=tuple(BoardType.values())[fields[2]],
+            fleet=[
+                ShipType(type)
+                for type in data[Session.HEADER.size : Session.HEADER.size + fields[4]]
+            ],
+        )
+        engine: Engine = session.engine
+        if fields[6] != Session.NO_MACHINE:
+            session.difficulty = MachineDifficulty(fields[6])
+            session.machine = session.difficulty.create(engine.boardSize, engine.fleet)
+
+        offset: int = Session.HEADER.size + fields[4]
+        orientations: list[ShipOrientation] = ShipOrientation.values()
+        for player, count in zip(PlayerType.values(), fields[7:9]):
+            for _ in range(count):
+                type, x, y, orientation = Session.SHIP.unpack_from(data, offset)
+                offset += Session.SHIP.size
+                engine.place(
+                    player, Ship(x, y, ShipType(type), orientations[orientation])
+                )
+
+        for _ in range(fields[9]):
+            x, y = Session.SHOT.unpack_from(data, offset)
+            offset += Session.SHOT.size
+            session.record(engine.turn, x, y)
+        return session
@@ -1,5 +1,7 @@
+from contextlib import contextmanager
 from io import TextIOWrapper
-from typing import Any, Literal, TypeAlias
+from os import fsync, getpid, path, remove, replace
+from typing import Any, Iterator, Literal, TypeAlias
 
 OpenTextMode: TypeAlias = Literal[
     "r+",
@@ -71,7 +73,16 @@ class Settings:
             return open(Settings.CONFIG_FILE, mode, encoding="utf-8")
 
     def __init__(self, defaults: dict[str, Any]) -> None:
+        self.defaults: dict[str, Any] = defaults
         self.values: dict[str, str] = {}
+        self.loaded: bool = False
+        self.dirty: bool = False
+        self.batchDepth: int = 0
+
+    def load(self) -> None:
+        if self.loaded:
+            return
+        self.loaded = True
 
         configFile: TextIOWrapper = Settings.getConfigFile()
         rawData: list[str] = configFile.readlines()
@@ -83,26 +94,71 @@ class Settings:
             [key, value] = line.split("=", 1)
             self.values[key] = value.replace("\n", "").replace("''", "'")
 
-        for k, v in defaults.items():
-            if self.values.get(k):
-                continue
-            self.setValue(k, v)
+        with self.batch():
+            for k, v in self.defaults.items():
+                if self.values.get(k):
+                    continue
+                self.setValue(k, v)
 
-    def setValue(self, key: str, value: Any) -> None:
-        if self.values.get(key) and self.values[key] == value:
+    @contextmanager
+    def batch(self) -> Iterator["Settings"]:
+        self.load()
+        snapshot: dict[str, str] | None = None
+        if not self.batchDepth:
+            snapshot = dict(self.values)
+
+        self.batchDepth += 1
+        try:
+            yield self
+        except BaseException:
+            if snapshot is not None:
+                self.values = snapshot
+                self.dirty = False
+            raise
+        finally:
+            self.batchDepth -= 1
+
+        if not self.batchDepth:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.dirty:
             return
 
-        self.values[key] = str(value)
         lines: list[str] = [f"{k}={v}\n" for k, v in self.values.items()]
-        configFile: TextIOWrapper = Settings.getConfigFile("w")
-        configFile.writelines(lines)
-        configFile.close()
+        tempPath: str = f"{Settings.CONFIG_FILE}.{getpid()}.tmp"
+        try:
+            with open(tempPath, "w", encoding="utf-8") as tempFile:
+                tempFile.writelines(lines)
+                tempFile.flush()
+                fsync(tempFile.fileno())
+            replace(tempPath, Settings.CONFIG_FILE)
+        except BaseException:
+            if path.exists(tempPath):
+                remove(tempPath)
+            raise
+
+        self.dirty = False
+
+    def setValue(self, key: str, value: Any) -> None:
+        self.load()
+        value = str(value)
+        if self.values.get(key) == value:
+            return
+
+        self.values[key] = value
+        self.dirty = True
+        if not self.batchDepth:
+            self.flush()
 
     def setValues(self, settings: dict[str, Any]) -> None:
-        for k, v in settings.items():
-            self.setValue(k, v)
+        with self.batch():
+            for k, v in settings.items():
+                self.setValue(k, v)
 
     def getValue(self, key: str) -> str:
+        if not self.loaded:
+            self.load()
         return self.values.get(key, "")
 
 
@@ -111,6 +167,12 @@ settings = Settings(
         "lang": "en",
         "langFolder": "./lang/",
         "savesFolder": "./saves/",
+        "statsFile": "./stats.db",
+        "journalsFolder": "./journals/",
+        "recordJournals": False,
+        "profile": "off",
+        "profilesFolder": "./profiles/",
         "firstLaunch": True,
+        "fleetPresets": "classic:A1 B1 S2 C1;russian:B1 S2 C3 P4;armada:A2 B2 S3 C3 P4",
     }
 )
@@ -0,0 +1,139 @@
+from settings import settings
+from engine import Engine, PlayerType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+class StatsSummary:
+    def __init__(self, row: tuple[int | float | None, ...]) -> None:
+        self.games: int = int(row[0] or 0)
+        self.humanWins: int = int(row[1] or 0)
+        self.machineWins: int = int(row[2] or 0)
+        self.humanShotsToWin: int = int(row[3] or 0)
+        self.machineShotsToWin: int = int(row[4] or 0)
+        self.duration: float = float(row[5] or 0)
+
+    def getWinRate(self, player: PlayerType) -> float:
+        wins: int = self.humanWins if player == PlayerType.Human else self.machineWins
+        return wins / self.games if self.games else 0.0
+
+    def getMeanShotsToWin(self, player: PlayerType) -> float:
+        if player == PlayerType.Human:
+            return self.humanShotsToWin / self.humanWins if self.humanWins else 0.0
+        return self.machineShotsToWin / self.machineWins if self.machineWins else 0.0
+
+    def getMeanDuration(self) -> float:
+        return self.duration / self.games if self.games else 0.0
+
+
+class StatsStore:
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            boardSize INTEGER NOT NULL,
+            ships INTEGER NOT NULL,
+            firstPlayer INTEGER NOT NULL,
+            winner INTEGER NOT NULL,
+            humanShots INTEGER NOT NULL,
+            machineShots INTEGER NOT NULL,
+            duration REAL NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS totals (
+            boardSize INTEGER PRIMARY KEY,
+            games INTEGER NOT NULL,
+            humanWins INTEGER NOT NULL,
+            machineWins INTEGER NOT NULL,
+            humanShotsToWin INTEGER NOT NULL,
+            machineShotsToWin INTEGER NOT NULL,
+            duration REAL NOT NULL
+        )""",
+    )
+
+    def __init__(self, path: str = "") -> None:
+        self.path: str = path
+        self.connection: "sqlite3.Connection | None" = None
+
+    def getPath(self) -> str:
+        return self.path or settings.getValue("statsFile")
+
+    def connect(self) -> "sqlite3.Connection":
+        if self.connection is None:
+            import sqlite3
+
+            self.connection = sqlite3.connect(self.getPath())
+            with self.connection:
+                for statement in StatsStore.SCHEMA:
+                    self.connection.execute(statement)
+        return self.connection
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def record(self, game: Engine, duration: float) -> None:
+        winner: PlayerType | None = game.winner
+        if winner is None:
+            raise ValueError("Can't record an unfinished game")
+
+        humanShots: int = game.getShotsFired(PlayerType.Human)
+        machineShots: int = game.getShotsFired(PlayerType.Machine)
+        humanWon: int = int(winner == PlayerType.Human)
+
+        connection: "sqlite3.Connection" = self.connect()
+        with connection:
+            connection.execute(
+                "INSERT INTO games (boardSize, ships, firstPlayer, winner, "
+                "humanShots, machineShots, duration) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    game.boardSize,
+                    game.shipsAmount,
+                    int(game.firstPlayer),
+                    int(winner),
+                    humanShots,
+                    machineShots,
+                    duration,
+                ),
+            )
+            connection.execute(
+                "INSERT INTO totals VALUES (?, 1, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (boardSize) DO UPDATE SET "
+                "games = games + 1, "
+                "humanWins = humanWins + excluded.humanWins, "
+                "machineWins = machineWins + excluded.machineWins, "
+                "humanShotsToWin = humanShotsToWin + excluded.humanShotsToWin, "
+                "machineShotsToWin = machineShotsToWin + excluded.machineShotsToWin, "
+                "duration = duration + excluded.duration",
+                (
+                    game.boardSize,
+                    humanWon,
+                    1 - humanWon,
+                    humanShots * humanWon,
+                    machineShots * (1 - humanWon),
+                    duration,
+                ),
+            )
+
+    def getSummary(self, boardSize: int | None = None) -> StatsSummary:
+        query: str = (
+            "SELECT SUM(games), SUM(humanWins), SUM(machineWins), "
+            "SUM(humanShotsToWin), SUM(machineShotsToWin), SUM(duration) FROM totals"
+        )
+        params: tuple[int, ...] = ()
+        if boardSize is not None:
+            query += " WHERE boardSize = ?"
+            params = (boardSize,)
+        return StatsSummary(self.connect().execute(query, params).fetchone())
+
+    def getBoardSizes(self) -> list[int]:
+        return [
+            row[0]
+            for row in self.connect().execute(
+                "SELECT boardSize FROM totals ORDER BY boardSize"
+            )
+        ]
+
+
+stats = StatsStore()
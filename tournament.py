@@ -0,0 +1,271 @@
+from ai import Machine, MachineDifficulty
+from argparse import ArgumentParser
+from board import BoardType
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from engine import Engine, PlayerType, ShipType, ShotResult
+from fleets import Fleets
+from layouts import LayoutPool
+from math import sqrt
+from os import cpu_count
+from random import seed as seedRandom
+from time import perf_counter
+
+
+class ChunkResult:
+    def __init__(self) -> None:
+        self.games: int = 0
+        self.wins: list[int] = [0, 0]
+        self.shots: list[int] = [0, 0]
+        self.shotsSquared: list[int] = [0, 0]
+
+    def add(self, winner: PlayerType, shots: int) -> None:
+        self.games += 1
+        self.wins[winner] += 1
+        self.shots[winner] += shots
+        self.shotsSquared[winner] += shots * shots
+
+    def merge(self, other: "ChunkResult") -> None:
+        self.games += other.games
+        for i in range(2):
+            self.wins[i] += other.wins[i]
+            self.shots[i] += other.shots[i]
+            self.shotsSquared[i] += other.shotsSquared[i]
+
+
+class Tournament:
+    Z = 1.96
+
+    @staticmethod
+    def playGame(
+        boardSize: int,
+        shipsAmount: int,
+        firstPlayer: PlayerType,
+        difficulties: tuple[MachineDifficulty, MachineDifficulty],
+        boardType: BoardType = BoardType.Bit,
+        fleet: list[ShipType] | None = None,
+        layouts: LayoutPool | None = None,
+    ) -> tuple[PlayerType, int]:
+        engine = Engine(boardSize, shipsAmount, firstPlayer, boardType, fleet)
+        for player in PlayerType.values():
+            if layouts is None:
+                engine.placeRandomShips(player)
+            else:
+                engine.placeShips(
+                    player,
+                    layouts.take(
+                        boardSize, engine.fleet, boardType == BoardType.Sparse
+                    ),
+                )
+        players: tuple[Machine, Machine] = (
+            difficulties[0].create(boardSize, engine.fleet, 0),
+            difficulties[1].create(boardSize, engine.fleet, 0),
+        )
+
+        while engine.winner is None:
+            turn: PlayerType = engine.turn
+            x, y = players[turn].getShot()
+            result: ShotResult = engine.fire(turn, x, y)
+            players[turn].record(x, y, result)
+
+        return engine.winner, engine.getShotsFired(engine.winner)
+
+    @staticmethod
+    def runChunk(
+        seed: int,
+        games: int,
+        boardSize: int,
+        shipsAmount: int,
+        difficulties: tuple[MachineDifficulty, MachineDifficulty],
+        boardType: BoardType = BoardType.Bit,
+        fleet: list[ShipType] | None = None,
+    ) -> ChunkResult:
+        seedRandom(seed)
+        result = ChunkResult()
+        with LayoutPool(seed=seed) as layouts:
+            for i in range(games):
+                firstPlayer: PlayerType = PlayerType(i % 2)
+                winner, shots = Tournament.playGame(
+                    boardSize,
+                    shipsAmount,
+                    firstPlayer,
+                    difficulties,
+                    boardType,
+                    fleet,
+                    layouts,
+                )
+                result.add(winner, shots)
+        return result
+
+    @staticmethod
+    def wilson(wins: int, games: int) -> tuple[float, float]:
+        if not games:
+            return 0.0, 0.0
+        z: float = Tournament.Z
+        p: float = wins / games
+        denominator: float = 1 + z * z / games
+        center: float = (p + z * z / (2 * games)) / denominator
+        margin: float = (
+            z * sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denominator
+        )
+        return center - margin, center + margin
+
+    @staticmethod
+    def meanInterval(total: int, squared: int, n: int) -> tuple[float, float]:
+        if not n:
+            return 0.0, 0.0
+        mean: float = total / n
+        variance: float = max(squared / n - mean * mean, 0.0)
+        if n > 1:
+            variance *= n / (n - 1)
+        return mean, Tournament.Z * sqrt(variance / n)
+
+    @staticmethod
+    def report(
+        result: ChunkResult,
+        difficulties: tuple[MachineDifficulty, MachineDifficulty],
+        elapsed: float,
+    ) -> None:
+        print(
+            f"{result.games} games in {elapsed:.2f}s "
+            f"({result.games / max(elapsed, 1e-9):.0f} games/s)"
+        )
+        for player in PlayerType.values():
+            wins: int = result.wins[player]
+            low, high = Tournament.wilson(wins, result.games)
+            mean, margin = Tournament.meanInterval(
+                result.shots[player], result.shotsSquared[player], wins
+            )
+            print(
+                f"{player.name} ({difficulties[player].name}): "
+                f"win rate {wins / max(result.games, 1):.2%} [{low:.2%}, {high:.2%}], "
+                f"mean shots to win {mean:.2f} ± {margin:.2f}"
+            )
+
+    @staticmethod
+    def run(
+        games: int,
+        boardSize: int,
+        shipsAmount: int,
+        difficulties: tuple[MachineDifficulty, MachineDifficulty],
+        workers: int,
+        chunkSize: int,
+        seed: int,
+        boardType: BoardType = BoardType.Bit,
+        fleet: list[ShipType] | None = None,
+    ) -> ChunkResult:
+        total = ChunkResult()
+        start: float = perf_counter()
+
+        with ProcessPoolExecutor(workers) as executor:
+            futures = []
+            for i, offset in enumerate(range(0, games, chunkSize)):
+                futures.append(
+                    executor.submit(
+                        Tournament.runChunk,
+                        seed * 1_000_003 + i,
+                        min(chunkSize, games - offset),
+                        boardSize,
+                        shipsAmount,
+                        difficulties,
+                        boardType,
+                        fleet,
+                    )
+                )
+
+            for future in as_completed(futures):
+                total.merge(future.result())
+                print(f"\r{total.games}/{games} games", end="", flush=True)
+
+        print()
+        Tournament.report(total, difficulties, perf_counter() - start)
+        return total
+
+    @staticmethod
+    def runBatch(
+        games: int,
+        boardSize: int,
+        shipsAmount: int,
+        difficulties: tuple[MachineDifficulty, MachineDifficulty],
+        batchSize: int,
+        seed: int,
+        fleet: list[ShipType] | None = None,
+    ) -> ChunkResult:
+        from batch import BatchEngine
+
+        total = ChunkResult()
+        start: float = perf_counter()
+        fleet = Engine(boardSize, shipsAmount, PlayerType.Human, fleet=fleet).fleet
+        policies = tuple(BatchEngine.createPolicy(d) for d in difficulties)
+
+        for i, offset in enumerate(range(0, games, batchSize)):
+            count: int = min(batchSize, games - offset)
+            batch = BatchEngine(count, boardSize, fleet, seed * 1_000_003 + i)
+            batch.placeFleets()
+            batch.setFirstPlayers([(offset + j) % 2 for j in range(count)])
+            batch.run(policies)
+            for winner, shots in batch.getResults():
+                total.add(winner, shots)
+            print(f"\r{total.games}/{games} games", end="", flush=True)
+
+        print()
+        Tournament.report(total, difficulties, perf_counter() - start)
+        return total
+
+    @staticmethod
+    def main(args: list[str]) -> None:
+        difficulties: list[str] = [d.lower() for d in MachineDifficulty.names()]
+        parser = ArgumentParser(prog="main.py tournament")
+        parser.add_argument("--games", type=int, default=1000)
+        parser.add_argument("--size", type=int, default=10)
+        parser.add_argument("--ships", default="5")
+        parser.add_argument(
+            "--players", nargs=2, choices=difficulties, default=difficulties[:2]
+        )
+        parser.add_argument("--workers", type=int, default=cpu_count() or 1)
+        parser.add_argument("--chunk", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--board",
+            choices=[type.value for type in BoardType.values()],
+            default=BoardType.Bit.value,
+        )
+        parser.add_argument("--batch", type=int, default=0)
+        options = parser.parse_args(args)
+        fleet: list[ShipType] | None = Fleets.parse(options.ships)
+        if fleet is None:
+            parser.error("--ships must be a ships amount, a preset or a fleet spec")
+        if not Fleets.canFit(options.size, fleet):
+            parser.error(
+                f"The fleet can't fit on a {options.size}x{options.size} board"
+            )
+        players: tuple[MachineDifficulty, MachineDifficulty] = (
+            MachineDifficulty.getByName(options.players[0].capitalize()),
+            MachineDifficulty.getByName(options.players[1].capitalize()),
+        )
+
+        if options.batch > 0:
+            try:
+                Tournament.runBatch(
+                    options.games,
+                    options.size,
+                    len(fleet),
+                    players,
+                    options.batch,
+                    options.seed,
+                    fleet,
+                )
+            except (RuntimeError, ValueError) as error:
+                parser.error(str(error))
+            return
+
+        Tournament.run(
+            options.games,
+            options.size,
+            len(fleet),
+            players,
+            options.workers,
+            options.chunk,
+            options.seed,
+            BoardType(options.board),
+            fleet,
+        )
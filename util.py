@@ -1,10 +1,10 @@
 import enum
-from os import system, name
 from random import randrange
 from types import MappingProxyType
 from typing import Any, Iterable, NoReturn, Self
 
 from lang import lang
+from render import renderer
 
 
 class Enum(enum.Enum):
@@ -50,11 +50,20 @@ enumAuto = enum.auto
 
 
 def clear() -> None:
-    system("cls" if name == "nt" else "clear")
+    renderer.clear()
+
+
+def echo(text: str = "") -> None:
+    renderer.echo(text)
 
 
 def pause() -> None:
-    system("pause")
+    prompt: str = lang.getMessage("pause")
+    renderer.track(prompt)
+    try:
+        input(prompt)
+    except (EOFError, KeyboardInterrupt):
+        echo()
 
 
 def close(code: str | int | None = None) -> NoReturn:
@@ -71,6 +80,7 @@ def toInt(str: str) -> int | None:
 
 
 def getInput(prompt: str) -> str:
+    renderer.track(prompt)
     try:
         return input(prompt)
     except EOFError: